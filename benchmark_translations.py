@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Translation Pipeline Benchmarks for PipBox
+Runs both generators' real per-locale code paths on synthetic en.json-shaped
+catalogs, times each stage and records peak memory with tracemalloc.
+Results are saved as JSON and compared against a stored baseline.
+
+    load, flatten     reading and flattening en.json
+    unflatten         rebuilding en.json from its flat pairs (checked to round-trip)
+    check, generate   generate_translations.py: manifest check, then generate_locale()
+    resolve, write    generate_all_translations.py: fallback resolution, then write_translation()
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import generate_all_translations
+import generate_translations
+from generate_translations import flatten_dict, hash_locale_inputs, is_up_to_date, iter_flat_items, unflatten_dict
+from translation_sources import LocaleSource
+
+STAGES = ['load', 'flatten', 'unflatten', 'check', 'generate', 'resolve', 'write']
+
+# (keys, depth, locales)
+QUICK_SCENARIOS = [
+    (100, 2, 22),
+    (1_000, 3, 22),
+    (10_000, 3, 22),
+    (1_000, 3, 200),
+]
+FULL_SCENARIOS = QUICK_SCENARIOS + [
+    (10_000, 6, 22),
+    (100_000, 3, 22),
+    (100_000, 4, 200),
+    (1_000_000, 4, 22),
+]
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'translation_baseline.json')
+
+def synthetic_catalog(keys, depth):
+    """Nested en.json-shaped dict with `keys` leaves, `depth` levels deep.
+
+    Sections fan out evenly; every 50th string carries a {duration}
+    placeholder and short strings repeat, as in the real catalog.
+    """
+    fanout = 2
+    while fanout ** depth < keys:
+        fanout += 1
+    catalog = {}
+    for i in range(keys):
+        node = catalog
+        rest = i
+        parts = []
+        for _ in range(depth):
+            parts.append(rest % fanout)
+            rest //= fanout
+        *parents, leaf = reversed(parts)
+        for level, part in enumerate(parents):
+            node = node.setdefault(f'section{level}_{part}', {})
+        if i % 50 == 0:
+            text = f'Session {i} complete. Time for a {{duration}} minute break.'
+        elif i % 7 == 0:
+            text = 'OK'
+        else:
+            text = f'Label number {i}'
+        node[f'key{leaf}'] = text
+    return catalog
+
+def synthetic_overrides(flat_en, locale, share=4):
+    """Translate every `share`-th key, like a partially translated locale."""
+    return {key: f'[{locale}] {value}' for n, (key, value) in enumerate(flat_en.items()) if n % share == 0}
+
+def write_sources(src_dir, flat_en, locales):
+    """Lay out translations_src/ for the synthetic locales.
+
+    Every locale gets manual overrides (generate_translations.py) and a
+    partial catalog (generate_all_translations.py); every tenth locale is an
+    alias of the one before it, like es-MX -> es.
+    """
+    for kind in ('manual', 'partial'):
+        os.makedirs(os.path.join(src_dir, kind), exist_ok=True)
+    for n, locale in enumerate(locales):
+        overrides = synthetic_overrides(flat_en, locale)
+        with open(os.path.join(src_dir, 'manual', f'{locale}.json'), 'w', encoding='utf-8') as f:
+            json.dump(overrides, f, ensure_ascii=False)
+        partial = locales[n - 1] if n % 10 == 9 else unflatten_dict(overrides)
+        with open(os.path.join(src_dir, 'partial', f'{locale}.json'), 'w', encoding='utf-8') as f:
+            json.dump(partial, f, ensure_ascii=False)
+
+@contextmanager
+def generator_sources(src_dir, translations_dir):
+    """Point both generators at a synthetic source tree and output directory.
+
+    Fresh LocaleSource objects are used, so source files are read again on
+    every pass just as in a real run.
+    """
+    saved = (
+        generate_translations.MANUAL_TRANSLATIONS, generate_all_translations.ALL_TRANSLATIONS,
+        generate_all_translations.SIMPLE_TRANSLATIONS, generate_all_translations.TRANSLATIONS_DIR,
+    )
+    generate_translations.MANUAL_TRANSLATIONS = LocaleSource('manual', src_dir)
+    generate_all_translations.ALL_TRANSLATIONS = LocaleSource('full', src_dir)
+    generate_all_translations.SIMPLE_TRANSLATIONS = LocaleSource('partial', src_dir)
+    generate_all_translations.TRANSLATIONS_DIR = translations_dir
+    try:
+        yield
+    finally:
+        (generate_translations.MANUAL_TRANSLATIONS, generate_all_translations.ALL_TRANSLATIONS,
+         generate_all_translations.SIMPLE_TRANSLATIONS, generate_all_translations.TRANSLATIONS_DIR) = saved
+
+def run_stages(en_path, locales, gen_dir, all_dir):
+    """Return one pass of the pipeline as (stage, callable) pairs.
+
+    The callables share state and must run in order, inside
+    generator_sources(src_dir, all_dir). Both output directories are emptied
+    first so every locale file is really rewritten.
+    """
+    state = {}
+    for directory in (gen_dir, all_dir):
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+
+    def load():
+        with open(en_path, 'r', encoding='utf-8') as f:
+            state['en'] = json.load(f)
+
+    def flatten():
+        state['flat_en'] = flatten_dict(state['en'])
+
+    def unflatten():
+        # unflatten_dict still runs in canonical_items(); make sure it round-trips
+        if unflatten_dict(iter_flat_items(state['en'])) != state['en']:
+            raise AssertionError('unflatten_dict(iter_flat_items(en)) does not reproduce en.json')
+
+    def check():
+        manual = generate_translations.MANUAL_TRANSLATIONS
+        state['tasks'] = []
+        for locale in locales:
+            inputs_hash = hash_locale_inputs(state['flat_en'], manual.get(locale, {}), locale)
+            if not is_up_to_date(None, inputs_hash, os.path.join(gen_dir, f'{locale}.json')):
+                state['tasks'].append((locale, locale, inputs_hash, None))
+
+    def generate():
+        generate_translations._init_job_state(state['flat_en'], gen_dir, False, frozenset())
+        for _ in map(generate_translations.generate_locale, state['tasks']):
+            pass
+        del state['tasks']
+
+    def resolve():
+        generate_all_translations._init_job_state(state['en'], False, False, frozenset())
+        resolver = generate_all_translations._job_state['resolver']
+        for locale in locales:
+            resolver.resolve(locale)
+
+    def write():
+        for locale in locales:
+            generate_all_translations.write_translation((locale, 'Basic translation'))
+        del state['en'], state['flat_en']
+
+    return list(zip(STAGES, [load, flatten, unflatten, check, generate, resolve, write]))
+
+def measure(keys, depth, locale_count, repeat=3):
+    """Time every stage (best of `repeat` passes), then run once more under tracemalloc for peak memory."""
+    locales = [f'l{n:03d}' for n in range(locale_count)]
+    with tempfile.TemporaryDirectory(prefix='pipbox-bench-') as tmp:
+        en_path = os.path.join(tmp, 'en.json')
+        src_dir = os.path.join(tmp, 'translations_src')
+        gen_dir = os.path.join(tmp, 'generated')
+        all_dir = os.path.join(tmp, 'all')
+        catalog = synthetic_catalog(keys, depth)
+        with open(en_path, 'w', encoding='utf-8') as f:
+            json.dump(catalog, f, ensure_ascii=False, indent=2)
+        write_sources(src_dir, flatten_dict(catalog), locales)
+        del catalog
+
+        results = {}
+        for _ in range(repeat):
+            with generator_sources(src_dir, all_dir):
+                for stage, func in run_stages(en_path, locales, gen_dir, all_dir):
+                    start = time.perf_counter()
+                    cpu_start = time.process_time()
+                    func()
+                    wall = time.perf_counter() - start
+                    cpu = time.process_time() - cpu_start
+                    best = results.setdefault(stage, {'seconds': wall, 'cpu_seconds': cpu})
+                    best['seconds'] = round(min(best['seconds'], wall), 6)
+                    best['cpu_seconds'] = round(min(best['cpu_seconds'], cpu), 6)
+
+        tracemalloc.start()
+        try:
+            with generator_sources(src_dir, all_dir):
+                for stage, func in run_stages(en_path, locales, gen_dir, all_dir):
+                    tracemalloc.reset_peak()
+                    before = tracemalloc.get_traced_memory()[0]
+                    func()
+                    results[stage]['peak_bytes'] = tracemalloc.get_traced_memory()[1] - before
+        finally:
+            tracemalloc.stop()
+
+    results['total'] = {
+        'seconds': round(sum(r['seconds'] for r in results.values()), 6),
+        'cpu_seconds': round(sum(r['cpu_seconds'] for r in results.values()), 6),
+        'peak_bytes': max(r['peak_bytes'] for r in results.values()),
+    }
+    return results
+
+def scenario_name(keys, depth, locales):
+    return f'keys={keys},depth={depth},locales={locales}'
+
+def compare(results, baseline, tolerance, min_seconds):
+    """List regressions: stages slower or hungrier than baseline by more than tolerance."""
+    regressions = []
+    for name, stages in results.items():
+        base_stages = baseline.get(name)
+        if not base_stages:
+            continue
+        for stage, current in stages.items():
+            base = base_stages.get(stage)
+            if not base:
+                continue
+            if current['seconds'] - base['seconds'] > min_seconds and current['seconds'] > base['seconds'] * (1 + tolerance):
+                regressions.append(f"{name} {stage}: {base['seconds']:.4f}s -> {current['seconds']:.4f}s")
+            if current['peak_bytes'] > base['peak_bytes'] * (1 + tolerance) and current['peak_bytes'] - base['peak_bytes'] > 64 * 1024:
+                regressions.append(f"{name} {stage}: peak {base['peak_bytes']} -> {current['peak_bytes']} bytes")
+    return regressions
+
+def format_results(results):
+    lines = [f"{'Scenario':<34} {'Stage':<10} {'Wall':>9} {'CPU':>9} {'Peak MiB':>9}"]
+    for name, stages in results.items():
+        for stage, r in stages.items():
+            lines.append(
+                f"{name:<34} {stage:<10} {r['seconds'] * 1000:>7.1f}ms {r['cpu_seconds'] * 1000:>7.1f}ms "
+                f"{r['peak_bytes'] / 2 ** 20:>9.2f}"
+            )
+    return '\n'.join(lines)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the translation generator stages.')
+    parser.add_argument('--full', action='store_true',
+                        help='include the large scenarios (up to 1M keys and 200 locales)')
+    parser.add_argument('--scenario', action='append', metavar='KEYS,DEPTH,LOCALES',
+                        help='run a custom scenario instead of the presets (repeatable)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timing passes per scenario; the fastest is kept (default: 3)')
+    parser.add_argument('--output', metavar='PATH', help='write results as JSON')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, metavar='PATH',
+                        help='baseline results to compare against')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown / memory growth before failing (default: 0.25)')
+    parser.add_argument('--min-seconds', type=float, default=0.005,
+                        help='ignore time differences smaller than this (default: 0.005)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.scenario:
+        scenarios = [tuple(int(n) for n in spec.split(',')) for spec in args.scenario]
+    else:
+        scenarios = FULL_SCENARIOS if args.full else QUICK_SCENARIOS
+
+    print("⏱  PipBox Translation Pipeline Benchmarks")
+    print("=" * 60)
+    results = {}
+    for keys, depth, locales in scenarios:
+        name = scenario_name(keys, depth, locales)
+        print(f"▶️  {name}")
+        results[name] = measure(keys, depth, locales, args.repeat)
+    print()
+    print(format_results(results))
+    print()
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"ℹ️  No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline['results'], args.tolerance, args.min_seconds)
+    for regression in regressions:
+        print(f"❌ {regression}")
+    if regressions:
+        return 1
+    print(f"✅ No regressions against baseline ({baseline.get('created', 'unknown date')})")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
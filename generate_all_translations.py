@@ -3,115 +3,234 @@
 Complete Translation Generator for PipBox - ALL 21 Languages
 Generates professional-quality translations for all UI strings
 """
+import argparse
 import json
 import os
 
-# Full Professional Translations for ALL Languages
-ALL_TRANS
+from generate_translations import (
+    canonical_items, flatten_dict, iter_json_chunks, job_count, run_jobs, write_chunks_atomic,
+)
+from translation_metrics import StageMetrics, add_profile_args, profile_options, publish
+from translation_sources import LocaleSource, parse_locale_filter
 
-LATIONS = {
-    # Already done: zh-Hans, zh-Hant, ja, de
+# Full Professional Translations (translations_src/full/<locale>.json)
+ALL_TRANSLATIONS = LocaleSource('full')
+
+# Simplified translations for remaining languages (user can enhance these),
+# merged over English; translations_src/partial/<locale>.json
+SIMPLE_TRANSLATIONS = LocaleSource('partial')
+
+TRANSLATIONS_DIR = 'assets/translations'
+FALLBACK_LOCALE = 'en'
+
+class FallbackCycleError(ValueError):
+    """A locale alias chain that loops back on itself (e.g. es-MX -> es -> es-MX)."""
+
+class FallbackResolver:
+    """Resolves each locale's fallback chain once, e.g. es-MX -> es -> en.
+
+    Every locale is deep-merged key by key over its parent. Resolved catalogs
+    are memoized, so locales that share a parent reuse it instead of reading
+    and copying it again, and each key remembers which layer supplied it.
+    """
     
-    'fr': {
-        "app": {"name": "PipBox", "tagline": "Votre compagnon de productivité"},
-        "timer": {"play": "Lecture", "pause": "Pause", "stop": "Arrêt", "reset": "Réinitialiser", "hours": "Heures", "minutes": "Minutes", "seconds": "Secondes", "setDuration": "Définir la durée", "enterDuration": "Entrer la durée (HH:MM:SS ou minutes)", "presets": "Préréglages rapides", "customTime": "Temps personnalisé", "focusTime": "Temps de concentration", "breakTime": "Temps de pause", "pomodoroWork": "Travail Pomodoro", "pomodoroBreak": "Pause Pomodoro"},
-        "settings": {"title": "Paramètres", "general": "Général", "language": "Langue", "notifications": "Notifications", "sounds": "Sons", "appearance": "Apparence", "about": "À propos", "version": "Version", "selectLanguage": "Sélectionner la langue", "enableNotifications": "Activer les notifications", "enableSounds": "Activer les sons", "soundVolume": "Volume sonore", "theme": "Thème", "darkMode": "Mode sombre", "lightMode": "Mode clair", "systemDefault": "Valeur par défaut du système"},
-        "onboarding": {"welcome": "Bienvenue sur PipBox", "welcomeMessage": "Votre compagnon minimaliste de productivité pour des sessions de travail concentrées", "next": "Suivant", "skip": "Passer", "getStarted": "Commencer", "finish": "Terminer", "step1Title": "Régler le minuteur", "step1Description": "Cliquez sur le minuteur pour définir votre durée de concentration. Utilisez les préréglages ou entrez un temps personnalisé.", "step2Title": "Concentration et flux", "step2Description": "Commencez votre session et laissez la fourmi guider votre progression du début à la fin.", "step3Title": "Technique Pomodoro", "step3Description": "Travaillez par intervalles concentrés de 25 minutes avec des pauses de 5 minutes. Prenez une pause plus longue après 4 sessions.", "step4Title": "Suivre vos progrès", "step4Description": "Regardez la fourmi traverser l'écran au fur et à mesure de votre session. Restez motivé!", "step5Title": "Notifications", "step5Description": "Soyez averti lorsque votre session se termine avec un son et des notifications système.", "step6Title": "Prêt à se concentrer", "step6Description": "Vous êtes prêt! Commencez votre première session et augmentez votre productivité."},
-        "notification": {"timeUp": "Temps écoulé!", "sessionComplete": "Votre session de concentration est terminée", "breakComplete": "Le temps de pause est terminé", "takeABreak": "C'est l'heure de la pause!", "workSessionComplete": "Session de travail terminée. C'est l'heure d'une pause de {duration} minutes."},
-        "menu": {"file": "Fichier", "edit": "Éditer", "view": "Affichage", "window": "Fenêtre", "help": "Aide", "quit": "Quitter PipBox", "preferences": "Préférences", "about": "À propos de PipBox", "minimize": "Réduire", "close": "Fermer"},
-        "common": {"ok": "OK", "cancel": "Annuler", "save": "Enregistrer", "delete": "Supprimer", "edit": "Éditer", "done": "Terminé", "close": "Fermer", "back": "Retour", "continue": "Continuer", "confirm": "Confirmer", "yes": "Oui", "no": "Non"},
-        "errors": {"invalidTime": "Format de temps invalide", "genericError": "Une erreur s'est produite. Veuillez réessayer.", "notificationPermission": "Permission de notification refusée"}
-    },
+    def __init__(self, en_template):
+        self.en_flat = flatten_dict(en_template)
+        self._resolved = {}
     
-    'es': {
-        "app": {"name": "PipBox", "tagline": "Tu compañero de productividad"},
-        "timer": {"play": "Reproducir", "pause": "Pausa", "stop": "Detener", "reset": "Restablecer", "hours": "Horas", "minutes": "Minutos", "seconds": "Segundos", "setDuration": "Establecer duración", "enterDuration": "Ingrese duración (HH:MM:SS o minutos)", "presets": "Ajustes rápidos", "customTime": "Tiempo personalizado", "focusTime": "Tiempo de concentración", "breakTime": "Tiempo de descanso", "pomodoroWork": "Trabajo Pomodoro", "pomodoroBreak": "Descanso Pomodoro"},
-        "settings": {"title": "Configuración", "general": "General", "language": "Idioma", "notifications": "Notificaciones", "sounds": "Sonidos", "appearance": "Apariencia", "about": "Acerca de", "version": "Versión", "selectLanguage": "Seleccionar idioma", "enableNotifications": "Habilitar notificaciones", "enableSounds": "Habilitar sonidos", "soundVolume": "Volumen de sonido", "theme": "Tema", "darkMode": "Modo oscuro", "lightMode": "Modo claro", "systemDefault": "Predeterminado del sistema"},
-        "onboarding": {"welcome": "Bienvenido a PipBox", "welcomeMessage": "Tu compañero minimalista de productividad para sesiones de trabajo enfocadas", "next": "Siguiente", "skip": "Saltar", "getStarted": "Comenzar", "finish": "Terminar", "step1Title": "Configura tu temporizador", "step1Description": "Haz clic en el temporizador para establecer tu duración de concentración. Usa ajustes preestablecidos o ingresa un tiempo personalizado.", "step2Title": "Concentración y flujo", "step2Description": "Comienza tu sesión y deja que la hormiga guíe tu progreso de principio a fin.", "step3Title": "Técnica Pomodoro", "step3Description": "Trabaja en intervalos enfocados de 25 minutos con descansos de 5 minutos. Toma un descanso más largo después de 4 sesiones.", "step4Title": "Rastrea tu progreso", "step4Description": "Observa a la hormiga recorrer la pantalla a medida que avanza tu sesión. ¡Mantente motivado!", "step5Title": "Notificaciones", "step5Description": "Recibe notificaciones cuando tu sesión se complete con sonido y notificaciones del sistema.", "step6Title": "Listo para concentrarse", "step6Description": "¡Todo listo! Comienza tu primera sesión y aumenta tu productividad."},
-        "notification": {"timeUp": "¡Se acabó el tiempo!", "sessionComplete": "Tu sesión de concentración está completa", "breakComplete": "El tiempo de descanso ha terminado", "takeABreak": "¡Hora de un descanso!", "workSessionComplete": "Sesión de trabajo completa. Hora de un descanso de {duration} minutos."},
-        "menu": {"file": "Archivo", "edit": "Editar", "view": "Ver", "window": "Ventana", "help": "Ayuda", "quit": "Salir de PipBox", "preferences": "Preferencias", "about": "Acerca de PipBox", "minimize": "Minimizar", "close": "Cerrar"},
-        "common": {"ok": "Aceptar", "cancel": "Cancelar", "save": "Guardar", "delete": "Eliminar", "edit": "Editar", "done": "Hecho", "close": "Cerrar", "back": "Atrás", "continue": "Continuar", "confirm": "Confirmar", "yes": "Sí", "no": "No"},
-        "errors": {"invalidTime": "Formato de tiempo inválido", "genericError": "Algo salió mal. Por favor, inténtalo de nuevo.", "notificationPermission": "Permiso de notificación denegado"}
-    },
+    def parent(self, locale):
+        if locale == FALLBACK_LOCALE:
+            return None
+        trans_data = SIMPLE_TRANSLATIONS.get(locale)
+        if isinstance(trans_data, str):  # Alias of another locale
+            return trans_data
+        return FALLBACK_LOCALE
     
-    'ko': {
-        "app": {"name": "PipBox", "tagline": "당신의 생산성 동반자"},
-        "timer": {"play": "재생", "pause": "일시정지", "stop": "정지", "reset": "초기화", "hours": "시간", "minutes": "분", "seconds": "초", "setDuration": "시간 설정", "enterDuration": "시간 입력 (HH:MM:SS 또는 분)", "presets": "빠른 설정", "customTime": "사용자 지정 시간", "focusTime": "집중 시간", "breakTime": "휴식 시간", "pomodoroWork": "뽀모도로 작업", "pomodoroBreak": "뽀모도로 휴식"},
-        "settings": {"title": "설정", "general": "일반", "language": "언어", "notifications": "알림", "sounds": "소리", "appearance": "모양", "about": "정보", "version": "버전", "selectLanguage": "언어 선택", "enableNotifications": "알림 활성화", "enableSounds": "소리 활성화", "soundVolume": "음량", "theme": "테마", "darkMode": "다크 모드", "lightMode": "라이트 모드", "systemDefault": "시스템 기본값"},
-        "onboarding": {"welcome": "PipBox에 오신 것을 환영합니다", "welcomeMessage": "집중 작업 세션을 위한 미니멀한 생산성 동반자", "next": "다음", "skip": "건너뛰기", "getStarted": "시작하기", "finish": "완료", "step1Title": "타이머 설정", "step1Description": "타이머를 클릭하여 집중 시간을 설정하세요. 프리셋을 사용하거나 사용자 지정 시간을 입력하세요.", "step2Title": "집중과 흐름", "step2Description": "세션을 시작하고 개미가 처음부터 끝까지 진행 상황을 안내하도록 하세요.", "step3Title": "뽀모도로 기법", "step3Description": "25분 집중 간격으로 작업하고 5분 휴식을 취하세요. 4회 후 더 긴 휴식을 취하세요.", "step4Title": "진행 상황 추적", "step4Description": "세션이 진행됨에 따라 화면을 가로지르는 개미를 보면서 동기를 유지하세요!", "step5Title": "알림", "step5Description": "세션이 완료되면 사운드 및 시스템 알림으로 알려드립니다.", "step6Title": "집중 준비 완료", "step6Description": "모든 준비가 완료되었습니다! 첫 번째 세션을 시작하여 생산성을 높이세요."},
-        "notification": {"timeUp": "시간 종료!", "sessionComplete": "집중 세션이 완료되었습니다", "breakComplete": "휴식 시간이 끝났습니다", "takeABreak": "휴식 시간입니다!", "workSessionComplete": "작업 세션 완료. {duration}분 휴식 시간입니다."},
-        "menu": {"file": "파일", "edit": "편집", "view": "보기", "window": "창", "help": "도움말", "quit": "PipBox 종료", "preferences": "환경설정", "about": "PipBox 정보", "minimize": "최소화", "close": "닫기"},
-        "common": {"ok": "확인", "cancel": "취소", "save": "저장", "delete": "삭제", "edit": "편집", "done": "완료", "close": "닫기", "back": "뒤로", "continue": "계속", "confirm": "확인", "yes": "예", "no": "아니오"},
-        "errors": {"invalidTime": "잘못된 시간 형식", "genericError": "문제가 발생했습니다. 다시 시도해 주세요.", "notificationPermission": "알림 권한이 거부되었습니다"}
-    },
+    def chain(self, locale):
+        """Return the lookup chain for locale, ending at the fallback locale."""
+        chain = []
+        while locale is not None:
+            if locale in chain:
+                raise FallbackCycleError(' -> '.join(chain + [locale]))
+            chain.append(locale)
+            locale = self.parent(locale)
+        return chain
     
-    'ar': {
-        "app": {"name": "PipBox", "tagline": "رفيقك في الإنتاجية"},
-        "timer": {"play": "تشغيل", "pause": "إيقاف مؤقت", "stop": "إيقاف", "reset": "إعادة تعيين", "hours": "ساعات", "minutes": "دقائق", "seconds": "ثواني", "setDuration": "تعيين المدة", "enterDuration": "أدخل المدة (HH:MM:SS أو دقائق)", "presets": "إعدادات سريعة", "customTime": "وقت مخصص", "focusTime": "وقت التركيز", "breakTime": "وقت الاستراحة", "pomodoroWork": "عمل بومودورو", "pomodoroBreak": "استراحة بومودورو"},
-        "settings": {"title": "الإعدادات", "general": "عام", "language": "اللغة", "notifications": "الإشعارات", "sounds": "الأصوات", "appearance": "المظهر", "about": "حول", "version": "الإصدار", "selectLanguage": "اختر اللغة", "enableNotifications": "تفعيل الإشعارات", "enableSounds": "تفعيل الأصوات", "soundVolume": "مستوى الصوت", "theme": "السمة", "darkMode": "الوضع الداكن", "lightMode": "الوضع الفاتح", "systemDefault": "افتراضي النظام"},
-        "onboarding": {"welcome": "مرحباً بك في PipBox", "welcomeMessage": "رفيقك البسيط في الإنتاجية لجلسات العمل المركزة", "next": "التالي", "skip": "تخطي", "getStarted": "ابدأ", "finish": "إنهاء", "step1Title": "اضبط المؤقت", "step1Description": "انقر على المؤقت لتعيين مدة التركيز. استخدم الإعدادات المسبقة أو أدخل وقتاً مخصصاً.", "step2Title": "التركيز والانسياب", "step2Description": "ابدأ جلستك ودع النملة تُرشدك من البداية إلى النهاية.", "step3Title": "تقنية بومودورو", "step3Description": "اعمل بفترات مركزة مدة 25 دقيقة مع استراحات 5 دقائق. خذ استراحة أطول بعد 4 جلسات.", "step4Title": "تتبع تقدمك", "step4Description": "شاهد النملة تعبر الشاشة مع تقدم جلstك. ابقَ متحف زاً!", "step5Title": "الإشعارات", "step5Description": "احصل على إشعار عند اكتمال جلستك بصوت وإشعارات النظام.", "step6Title": "جاهز للتركيز", "step6Description": "أنت جاهز! ابدأ جلستك الأولى وعزز إنتاجيتك."},
-        "notification": {"timeUp": "انتهى الوقت!", "sessionComplete": "اكتملت جلسة التركيز", "breakComplete": "انتهى وقت الاستراحة", "takeABreak": "حان وقت الاستراحة!", "workSessionComplete": "اكتملت جلسة العمل. حان وقت استراحة {duration} دقيقة."},
-        "menu": {"file": "ملف", "edit": "تحرير", "view": "عرض", "window": "نافذة", "help": "مساعدة", "quit": "إنهاء PipBox", "preferences": "التفضيلات", "about": "حول PipBox", "minimize": "تصغير", "close": "إغلاق"},
-        "common": {"ok": "موافق", "cancel": "إلغاء", "save": "حفظ", "delete": "حذف", "edit": "تحرير", "done": "تم", "close": "إغلاق", "back": "رجوع", "continue": "متابعة", "confirm": "تأكيد", "yes": "نعم", "no": "لا"},
-        "errors": {"invalidTime": "تنسيق وقت غير صالح", "genericError": "حدث خطأ ما. يرجى المحاولة مرة أخرى.", "notificationPermission": "تم رفض إذن الإشعارات"}
-    }
-}
+    def own_layer(self, locale):
+        """Flattened strings defined by the locale itself (not inherited)."""
+        if locale == FALLBACK_LOCALE:
+            return self.en_flat
+        if locale in ALL_TRANSLATIONS:
+            return flatten_dict(ALL_TRANSLATIONS[locale])
+        trans_data = SIMPLE_TRANSLATIONS.get(locale)
+        if isinstance(trans_data, str):
+            return {}
+        if trans_data is not None:
+            return flatten_dict(trans_data)
+        # Not generated here; use whatever is already on disk
+        with open(f'{TRANSLATIONS_DIR}/{locale}.json', 'r', encoding='utf-8') as f:
+            return flatten_dict(json.load(f))
+    
+    def resolve(self, locale):
+        """Return (flat_strings, provenance) where provenance maps key -> supplying locale."""
+        for name in reversed(self.chain(locale)):
+            if name in self._resolved:
+                continue
+            layer = self.own_layer(name)
+            parent = self.parent(name)
+            if parent is None:
+                resolved = (layer, dict.fromkeys(layer, name))
+            elif not layer:
+                # Pure alias: share the parent's catalog outright
+                resolved = self._resolved[parent]
+            else:
+                strings, provenance = self._resolved[parent]
+                strings = {**strings, **layer}
+                provenance = {**provenance, **dict.fromkeys(layer, name)}
+                resolved = (strings, provenance)
+            self._resolved[name] = resolved
+        return self._resolved[locale]
+
+def layer_summary(provenance, chain):
+    """e.g. 'es-MX 0, es 107, en 12' in chain order."""
+    counts = dict.fromkeys(chain, 0)
+    for name in provenance.values():
+        counts[name] += 1
+    return ', '.join(f'{name} {count}' for name, count in counts.items())
+
+# Resolver shared by every locale task (set once per worker)
+_job_state = {}
+
+def _init_job_state(en_template, with_provenance, minify, pruned, profile=(False, False)):
+    _job_state.update(
+        resolver=FallbackResolver(en_template), with_provenance=with_provenance, minify=minify,
+        pruned=pruned, metrics=StageMetrics(*profile),
+    )
 
-# Simplified translations for remaining languages (user can enhance these)
-SIMPLE_TRANSLATIONS = {
-    'es-MX': "es",  # Copy from es
-    'pt-BR': {"app": {"name": "PipBox", "tagline": "Seu companheiro de produtividade"}, "timer": {"play": "Reproduzir", "pause": "Pausar", "stop": "Parar", "reset": "Redefinir"}, "settings": {"title": "Configurações", "language": "Idioma"}, "common": {"ok": "OK", "cancel": "Cancelar", "save": "Salvar"}},
-    'pt-PT': {"app": {"name": "PipBox", "tagline": "O seu companheiro de produtividade"}, "timer": {"play": "Reproduzir", "pause": "Pausar", "stop": "Parar", "reset": "Redefinir"}, "settings": {"title": "Definições", "language": "Idioma"}, "common": {"ok": "OK", "cancel": "Cancelar", "save": "Guardar"}},
-    'hi': {"app": {"name": "PipBox", "tagline": "आपका उत्पादकता साथी"}, "timer": {"play": "चलाएं", "pause": "रोकें", "stop": "बंद करें", "reset": "रीसेट करें"}, "settings": {"title": "सेटिंग्स", "language": "भाषा"}, "common": {"ok": "ठीक है", "cancel": "रद्द करें", "save": "सहेजें"}},
-    'it': {"app": {"name": "PipBox", "tagline": "Il tuo compagno di produttività"}, "timer": {"play": "Riproduci", "pause": "Pausa", "stop": "Stop", "reset": "Ripristina"}, "settings": {"title": "Impostazioni", "language": "Lingua"}, "common": {"ok": "OK", "cancel": "Annulla", "save": "Salva"}},
-    'nl': {"app": {"name": "PipBox", "tagline": "Uw productiviteitsmetgezel"}, "timer": {"play": "Afspelen", "pause": "Pauzeren", "stop": "Stoppen", "reset": "Resetten"}, "settings": {"title": "Instellingen", "language": "Taal"}, "common": {"ok": "OK", "cancel": "Annuleren", "save": "Opslaan"}},
-    'ru': {"app": {"name": "PipBox", "tagline": "Ваш спутник продуктивности"}, "timer": {"play": "Воспроизвести", "pause": "Пауза", "stop": "Стоп", "reset": "Сброс"}, "settings": {"title": "Настройки", "language": "Язык"}, "common": {"ok": "ОК", "cancel": "Отмена", "save": "Сохранить"}},
-    'tr': {"app": {"name": "PipBox", "tagline": "Üretkenlik yardımcınız"}, "timer": {"play": "Oynat", "pause": "Duraklat", "stop": "Durdur", "reset": "Sıfırla"}, "settings": {"title": "Ayarlar", "language": "Dil"}, "common": {"ok": "Tamam", "cancel": "İptal", "save": "Kaydet"}},
-    'sv': {"app": {"name": "PipBox", "tagline": "Din produktivitetspartner"}, "timer": {"play": "Spela", "pause": "Paus", "stop": "Stopp", "reset": "Återställ"}, "settings": {"title": "Inställningar", "language": "Språk"}, "common": {"ok": "OK", "cancel": "Avbryt", "save": "Spara"}},
-    'pl': {"app": {"name": "PipBox", "tagline": "Twój towarzysz produktywności"}, "timer": {"play": "Odtwórz", "pause": "Pauza", "stop": "Zatrzymaj", "reset": "Zresetuj"}, "settings": {"title": "Ustawienia", "language": "Język"}, "common": {"ok": "OK", "cancel": "Anuluj", "save": "Zapisz"}},
-    'id': {"app": {"name": "PipBox", "tagline": "Teman produktivitas Anda"}, "timer": {"play": "Mainkan", "pause": "Jeda", "stop": "Berhenti", "reset": "Atur Ulang"}, "settings": {"title": "Pengaturan", "language": "Bahasa"}, "common": {"ok": "OK", "cancel": "Batal", "save": "Simpan"}},
-    'th': {"app": {"name": "PipBox", "tagline": "เพื่อนคู่คิดด้านประสิทธิภาพของคุณ"}, "timer": {"play": "เล่น", "pause": "หยุดชั่วคราว", "stop": "หยุด", "reset": "รีเซ็ต"}, "settings": {"title": "การตั้งค่า", "language": "ภาษา"}, "common": {"ok": "ตกลง", "cancel": "ยกเลิก", "save": "บันทึก"}},
-    'vi': {"app": {"name": "PipBox", "tagline": "Người bạn đồng hành năng suất của bạn"}, "timer": {"play": "Phát", "pause": "Tạm dừng", "stop": "Dừng", "reset": "Đặt lại"}, "settings": {"title": "Cài đặt", "language": "Ngôn ngữ"}, "common": {"ok": "OK", "cancel": "Hủy", "save": "Lưu"}},
-}
+def _source_bytes_read():
+    return ALL_TRANSLATIONS.bytes_read + SIMPLE_TRANSLATIONS.bytes_read
 
-def main():
-    translations_dir = 'assets/translations'
+def write_translation(task):
+    """Resolve and write one locale; returns (log_line, provenance or None, metrics)."""
+    locale, label = task
+    resolver = _job_state['resolver']
+    metrics = _job_state['metrics']
+    output_path = f'{TRANSLATIONS_DIR}/{locale}.json'
+    with metrics.stage('resolve', locale) as stage:
+        loaded = _source_bytes_read()
+        strings, provenance = resolver.resolve(locale)
+        pruned = _job_state['pruned']
+        if pruned:
+            strings = {key: value for key, value in strings.items() if key not in pruned}
+            provenance = {key: name for key, name in provenance.items() if key not in pruned}
+        stage['bytes_read'] = _source_bytes_read() - loaded
+        stage['keys'] = len(strings)
+        if locale != FALLBACK_LOCALE:
+            stage['placeholder_fills'] = sum(1 for name in provenance.values() if name == FALLBACK_LOCALE)
+    with metrics.stage('write', locale) as stage:
+        # en.json order first, locale-only keys slotted into their sections
+        extras = [key for key in strings if key not in resolver.en_flat]
+        items = canonical_items(resolver.en_flat, strings, extras)
+        _, changed, compared = write_chunks_atomic(output_path, iter_json_chunks(items, _job_state['minify']))
+        stage['keys'] = len(strings)
+    if metrics.enabled:
+        stage['bytes_read'] = compared
+        stage['bytes_written'] = os.path.getsize(output_path) if changed else 0
+    chain = resolver.chain(locale)
+    line = f"✅ {locale}.json - {label} ({layer_summary(provenance, chain)})"
+    return line, provenance if _job_state['with_provenance'] else None, metrics.take()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Generate every PipBox locale file.')
+    parser.add_argument('--jobs', '-j', type=job_count, default=1, metavar='N',
+                        help='generate locales on N worker processes (0 = one per CPU)')
+    parser.add_argument('--provenance', metavar='PATH',
+                        help='write a JSON report of which locale supplied every key')
+    parser.add_argument('--minify', action='store_true',
+                        help='write compact JSON without indentation')
+    parser.add_argument('--bundle', metavar='PATH',
+                        help='also pack all locales into one deduplicated bundle file')
+    parser.add_argument('--locale', type=parse_locale_filter, metavar='LOCALES',
+                        help='only generate these comma-separated locales, e.g. fr,es')
+    parser.add_argument('--prune-unused', action='store_true',
+                        help="leave out en.json keys that no .tr() call in lib/ uses")
+    add_profile_args(parser)
+    args = parser.parse_args(argv)
+    known = set(ALL_TRANSLATIONS) | set(SIMPLE_TRANSLATIONS)
+    unknown = [locale for locale in args.locale or [] if locale not in known]
+    if unknown:
+        parser.error(f"unknown locale(s): {', '.join(unknown)}")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    metrics = StageMetrics(*profile_options(args))
     
     print("🌍 Generating ALL translations...")
     print("=" * 60)
     
     # Load English as template
-    with open(f'{translations_dir}/en.json', 'r', encoding='utf-8') as f:
-        en_template = json.load(f)
+    en_path = f'{TRANSLATIONS_DIR}/en.json'
+    with metrics.stage('load') as stage:
+        with open(en_path, 'r', encoding='utf-8') as f:
+            en_template = json.load(f)
+        stage['bytes_read'] = os.path.getsize(en_path)
     
-    count = 0
+    tasks = [(locale, 'Complete translation') for locale in ALL_TRANSLATIONS]
+    tasks += [(locale, 'Basic translation') for locale in SIMPLE_TRANSLATIONS]
+    if args.locale is not None:
+        tasks = [task for task in tasks if task[0] in args.locale]
     
-    # Write complete translations
-    for locale, trans_data in ALL_TRANSLATIONS.items():
-        with open(f'{translations_dir}/{locale}.json', 'w', encoding='utf-8') as f:
-            json.dump(trans_data, f, ensure_ascii=False, indent=2)
-        print(f"✅ {locale}.json - Complete translation")
-        count += 1
+    # Fail fast on alias cycles before any worker starts writing
+    resolver = FallbackResolver(en_template)
+    try:
+        for locale, _ in tasks:
+            resolver.chain(locale)
+    except FallbackCycleError as e:
+        print(f"❌ Locale fallback cycle: {e}")
+        return 2
     
-    # Write simplified translations (merge with English template)
-    for locale, trans_data in SIMPLE_TRANSLATIONS.items():
-        if isinstance(trans_data, str):  # Copy from another locale
-            source_locale = trans_data
-            with open(f'{translations_dir}/{source_locale}.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        else:
-            # Merge with English template
-            data = en_template.copy()
-            data.update(trans_data)
-        
-        with open(f'{translations_dir}/{locale}.json', 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"✅ {locale}.json - Basic translation")
+    pruned = frozenset()
+    if args.prune_unused:
+        from scan_translation_keys import used_key_filter
+        with metrics.stage('prune') as stage:
+            is_used = used_key_filter()
+            pruned = frozenset(key for key in resolver.en_flat if not is_used(key))
+            stage['keys'] = len(pruned)
+        print(f"✂️  Pruned {len(pruned)} keys not used in lib/")
+    
+    count = 0
+    report = {}
+    for line, provenance, task_metrics in run_jobs(
+        write_translation, tasks, args.jobs,
+        initializer=_init_job_state,
+        initargs=(en_template, bool(args.provenance), args.minify, pruned, profile_options(args)),
+    ):
+        print(line)
         count += 1
+        metrics.merge(task_metrics)
+        if provenance is not None:
+            report[tasks[count - 1][0]] = provenance
+    
+    if args.provenance:
+        with metrics.stage('provenance') as stage:
+            with open(args.provenance, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            stage['bytes_written'] = os.path.getsize(args.provenance)
+        print(f"🧭 Key provenance written to {args.provenance}")
+    
+    if args.bundle:
+        from translation_bundle import write_bundle
+        with metrics.stage('bundle') as stage:
+            size, catalogs = write_bundle(TRANSLATIONS_DIR, args.bundle)
+            stage['bytes_written'] = size
+        print(f"📦 Bundled {len(catalogs)} locales into {args.bundle} ({size} bytes)")
     
     print("=" * 60)
     print(f"✨ Generated {count} translations!")
-    print("📢 All 22 languages are now ready to use!")
+    if args.locale is None:
+        print("📢 All 22 languages are now ready to use!")
+    publish(metrics, args, 'generate_all_translations', jobs=args.jobs, minify=args.minify)
 
 if __name__ == '__main__':
-    main()
+    raise SystemExit(main())
@@ -1,11 +1,24 @@
 #!/usr/bin/env python3
 """
 Automatic Translation Generator for PipBox
-Translates en.json into all 21 supported languages using AI translation.
+Translates en.json into all 21 supported languages using AI translation
+(see translation_providers.py; without --provider, untranslated strings keep English).
 """
 
+import argparse
+import hashlib
+import itertools
 import json
 import os
+import uuid
+from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor
+from json.encoder import encode_basestring
+
+from translation_memory import TranslationMemory, age_limit, entry_limit
+from translation_metrics import StageMetrics, add_profile_args, profile_options, publish
+from translation_providers import PROVIDERS, get_provider, non_negative_int, positive_int, translate_catalogs
+from translation_sources import LocaleSource, parse_locale_filter
 
 # Language mapping: (locale_code, language_name_for_context)
 LANGUAGES = [
@@ -33,196 +46,591 @@ LANGUAGES = [
 ]
 
 # Manual high-quality translations for common UI elements
-MANUAL_TRANSLATIONS = {
-    'zh-Hans': {
-        'app.name': 'PipBox',
-        'app.tagline': '您的生产力伙伴',
-        'timer.play': '播放',
-        'timer.pause': '暂停',
-        'timer.stop': '停止',
-        'timer.reset': '重置',
-        'settings.title': '设置',
-        'settings.language': '语言',
-        'common.ok': '确定',
-        'common.cancel': '取消',
-        'common.save': '保存',
-    },
-    'zh-Hant': {
-        'app.name': 'PipBox',
-        'app.tagline': '您的生產力夥伴',
-        'timer.play': '播放',
-        'timer.pause': '暫停',
-        'timer.stop': '停止',
-        'timer.reset': '重置',
-        'settings.title': '設定',
-        'settings.language': '語言',
-        'common.ok': '確定',
-        'common.cancel': '取消',
-        'common.save': '儲存',
-    },
-    'ja': {
-        'app.name': 'PipBox',
-        'app.tagline': 'あなたの生産性パートナー',
-        'timer.play': '再生',
-        'timer.pause': '一時停止',
-        'timer.stop': '停止',
-        'timer.reset': 'リセット',
-        'settings.title': '設定',
-        'settings.language': '言語',
-        'common.ok': 'OK',
-        'common.cancel': 'キャンセル',
-        'common.save': '保存',
-    },
-    'de': {
-        'app.name': 'PipBox',
-        'app.tagline': 'Ihr Produktivitätsbegleiter',
-        'timer.play': 'Abspielen',
-        'timer.pause': 'Pause',
-        'timer.stop': 'Stopp',
-        'timer.reset': 'Zurücksetzen',
-        'settings.title': 'Einstellungen',
-        'settings.language': 'Sprache',
-        'common.ok': 'OK',
-        'common.cancel': 'Abbrechen',
-        'common.save': 'Speichern',
-    },
-    'fr': {
-        'app.name': 'PipBox',
-        'app.tagline': 'Votre compagnon de productivité',
-        'timer.play': 'Lecture',
-        'timer.pause': 'Pause',
-        'timer.stop': 'Arrêt',
-        'timer.reset': 'Réinitialiser',
-        'settings.title': 'Paramètres',
-        'settings.language': 'Langue',
-        'common.ok': 'OK',
-        'common.cancel': 'Annuler',
-        'common.save': 'Enregistrer',
-    },
-    'es': {
-        'app.name': 'PipBox',
-        'app.tagline': 'Tu compañero de productividad',
-        'timer.play': 'Reproducir',
-        'timer.pause': 'Pausa',
-        'timer.stop': 'Detener',
-        'timer.reset': 'Restablecer',
-        'settings.title': 'Configuración',
-        'settings.language': 'Idioma',
-        'common.ok': 'Aceptar',
-        'common.cancel': 'Cancelar',
-        'common.save': 'Guardar',
-    },
-    'ko': {
-        'app.name': 'PipBox',
-        'app.tagline': '당신의 생산성 동반자',
-        'timer.play': '재생',
-        'timer.pause': '일시정지',
-        'timer.stop': '정지',
-        'timer.reset': '초기화',
-        'settings.title': '설정',
-        'settings.language': '언어',
-        'common.ok': '확인',
-        'common.cancel': '취소',
-        'common.save': '저장',
-    },
-    'ar': {
-        'app.name': 'PipBox',
-        'app.tagline': 'رفيقك في الإنتاجية',
-        'timer.play': 'تشغيل',
-        'timer.pause': 'إيقاف مؤقت',
-        'timer.stop': 'إيقاف',
-        'timer.reset': 'إعادة تعيين',
-        'settings.title': 'الإعدادات',
-        'settings.language': 'اللغة',
-        'common.ok': 'موافق',
-        'common.cancel': 'إلغاء',
-        'common.save': 'حفظ',
-    },
-}
+# (translations_src/manual/<locale>.json, loaded on first use)
+MANUAL_TRANSLATIONS = LocaleSource('manual')
+
+class KeyCollisionError(ValueError):
+    """Two dot-notation keys that cannot coexist in one nested catalog (e.g. `a.b` and `a.b.c`)."""
+
+def iter_flat_items(d, sep='.'):
+    """Yield (dot_key, value) pairs depth-first, in the dictionary's own key order.
+
+    Walks an explicit stack of item iterators, so no intermediate dicts are
+    built and memory is bounded by nesting depth rather than catalog size.
+    """
+    stack = [('', iter(d.items()))]
+    while stack:
+        parent_key, items = stack[-1]
+        for k, v in items:
+            new_key = f"{parent_key}{sep}{k}" if parent_key else k
+            if isinstance(v, dict):
+                stack.append((new_key, iter(v.items())))
+                break
+            yield new_key, v
+        else:
+            stack.pop()
 
 def flatten_dict(d, parent_key='', sep='.'):
     """Flatten nested dictionary into dot-notation keys."""
-    items = []
-    for k, v in d.items():
-        new_key = f"{parent_key}{sep}{k}" if parent_key else k
-        if isinstance(v, dict):
-            items.extend(flatten_dict(v, new_key, sep=sep).items())
-        else:
-            items.append((new_key, v))
-    return dict(items)
+    result = {}
+    for key, value in iter_flat_items(d, sep=sep):
+        if parent_key:
+            key = f"{parent_key}{sep}{key}"
+        if key in result:
+            raise KeyCollisionError(f"duplicate key '{key}' after flattening")
+        result[key] = value
+    return result
 
 def unflatten_dict(d, sep='.'):
-    """Convert dot-notation keys back to nested dictionary."""
+    """Convert dot-notation keys back to nested dictionary.
+
+    Accepts a dict or any iterable of (key, value) pairs and keeps their order.
+    Consecutive keys usually share a prefix, so the branch built for the
+    previous key is reused instead of being walked again from the root.
+    """
+    items = d.items() if isinstance(d, dict) else d
     result = {}
-    for key, value in d.items():
-        parts = key.split(sep)
-        current = result
-        for part in parts[:-1]:
-            if part not in current:
-                current[part] = {}
-            current = current[part]
-        current[parts[-1]] = value
+    path = []         # key parts of the current branch
+    nodes = [result]  # nodes[i + 1] is the dict at path[i]
+    for key, value in items:
+        *parents, leaf = key.split(sep)
+        
+        depth = 0
+        shared = min(len(path), len(parents))
+        while depth < shared and path[depth] == parents[depth]:
+            depth += 1
+        del path[depth:]
+        del nodes[depth + 1:]
+        
+        node = nodes[-1]
+        for part in parents[depth:]:
+            child = node.get(part)
+            if child is None:
+                child = node[part] = {}
+            elif not isinstance(child, dict):
+                conflict = sep.join(path + [part])
+                raise KeyCollisionError(f"'{key}' conflicts with existing key '{conflict}'")
+            path.append(part)
+            nodes.append(child)
+            node = child
+        
+        if leaf in node:
+            if isinstance(node[leaf], dict):
+                raise KeyCollisionError(f"'{key}' conflicts with nested keys under '{key}{sep}'")
+            raise KeyCollisionError(f"duplicate key '{key}'")
+        node[leaf] = value
     return result
 
-def main():
+def canonical_items(order, values, extras=(), sep='.'):
+    """Yield (key, values[key]) in the key order of `order` (normally flat_en).
+
+    Keys of `order` missing from values are skipped. extras are keys absent
+    from `order`; each one is slotted in right after the last key of its
+    deepest existing section, where unflatten_dict would have nested it, so
+    every section stays contiguous and can be streamed by iter_json_chunks().
+    """
+    slots = {}
+    if extras:
+        last = {}
+        for index, key in enumerate(order):
+            prefix = ''
+            for part in key.split(sep)[:-1]:
+                prefix = f"{prefix}{sep}{part}" if prefix else part
+                last[prefix] = index
+        groups = {}
+        for key in extras:
+            slot = (-1, 0)  # after everything
+            parts = key.split(sep)[:-1]
+            for depth in range(len(parts), 0, -1):
+                prefix = sep.join(parts[:depth])
+                if prefix in last:
+                    slot = (last[prefix], -depth)
+                    break
+            groups.setdefault(slot, []).append((key, values[key]))
+        # Several sections can end on the same key; the innermost closes
+        # first. Extras within one section may interleave, so regroup them.
+        for (index, _), items in sorted(groups.items()):
+            slots.setdefault(index, []).extend(iter_flat_items(unflatten_dict(items, sep), sep))
+
+    for index, key in enumerate(order):
+        if key in values:
+            yield key, values[key]
+        if index in slots:
+            yield from slots[index]
+    yield from slots.get(-1, ())
+
+def iter_json_chunks(items, minify=False, sep='.'):
+    """Stream grouped dot-notation (key, value) pairs as nested JSON text.
+
+    Output matches json.dumps(unflatten_dict(items), ensure_ascii=False,
+    indent=2) (or the compact form with minify) byte for byte, but only the
+    currently open path is held, so memory grows with nesting depth rather
+    than catalog size. Keys must arrive grouped by section, as produced by
+    iter_flat_items() or canonical_items().
+    """
+    if minify:
+        newline, indent, colon = '', '', ':'
+    else:
+        newline, indent, colon = '\n', '  ', ': '
+    path = []        # names of the objects currently open below the root
+    names = [{}]     # member names written at each open level -> is a section
+
+    yield '{'
+    for key, value in items:
+        *parents, leaf = key.split(sep)
+        depth = 0
+        shared = min(len(path), len(parents))
+        while depth < shared and path[depth] == parents[depth]:
+            depth += 1
+        while len(path) > depth:
+            yield f'{newline}{indent * len(path)}}}'
+            path.pop()
+            names.pop()
+        prefix = newline + indent * (len(path) + 1)
+
+        for part in parents[depth:]:
+            if part in names[-1]:
+                section = sep.join(path + [part])
+                if names[-1][part]:
+                    raise ValueError(f"keys under '{section}{sep}' are not grouped together")
+                raise KeyCollisionError(f"'{key}' conflicts with existing key '{section}'")
+            comma = ',' if names[-1] else ''
+            yield f'{comma}{prefix}{encode_basestring(part)}{colon}{{'
+            names[-1][part] = True
+            path.append(part)
+            names.append({})
+            prefix += indent
+
+        if isinstance(value, str):
+            encoded = encode_basestring(value)
+        elif minify:
+            encoded = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+        else:
+            encoded = json.dumps(value, ensure_ascii=False, indent=2).replace('\n', prefix)
+        if leaf in names[-1]:
+            if names[-1][leaf]:
+                raise KeyCollisionError(f"'{key}' conflicts with nested keys under '{key}{sep}'")
+            raise KeyCollisionError(f"duplicate key '{key}'")
+        comma = ',' if names[-1] else ''
+        yield f'{comma}{prefix}{encode_basestring(leaf)}{colon}{encoded}'
+        names[-1][leaf] = False
+
+    while path:
+        yield f'{newline}{indent * len(path)}}}'
+        path.pop()
+    yield f'{newline}}}' if names[0] else '}'
+
+# Bump when the generated file layout changes so every locale is rebuilt once
+MANIFEST_VERSION = 2
+CACHE_DIR = '.translation_cache'
+MANIFEST_FILE = 'manifest.json'
+MEMORY_FILE = 'memory.sqlite3'
+
+def hash_locale_inputs(flat_en, overrides, lang_name, minify=False, provider=None, pruned=()):
+    """Content hash of everything that feeds a single locale file."""
+    payload = json.dumps(
+        [MANIFEST_VERSION, lang_name, minify, provider, sorted(pruned),
+         list(flat_en.items()), list(overrides.items())],
+        ensure_ascii=False,
+        separators=(',', ':'),
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def load_manifest(manifest_path):
+    """Load the build manifest, or an empty one if missing or outdated."""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {'version': MANIFEST_VERSION, 'locales': {}}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {'version': MANIFEST_VERSION, 'locales': {}}
+    return manifest
+
+def _hash_file(path):
+    """(sha256 hex digest, bytes read) of a file; (None, 0) if it does not exist."""
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 16), b''):
+                digest.update(block)
+                size += len(block)
+    except OSError:
+        return None, 0
+    return digest.hexdigest(), size
+
+def file_sha256(path):
+    """sha256 hex digest of a file, read in blocks; None if it does not exist."""
+    return _hash_file(path)[0]
+
+def file_size(path):
+    """Size of a file in bytes; 0 if it does not exist."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def _write_blocks_atomic(path, blocks, keep_identical):
+    """Write byte blocks to a temp file beside path, then rename it into place.
+
+    Readers (and the app) only ever see the old file or the complete new one.
+    With keep_identical, an existing file with the same content is left
+    untouched so its mtime survives. Returns (sha256 hex digest, changed,
+    bytes read comparing against the existing file).
+    """
+    directory = os.path.dirname(path) or '.'
+    tmp_path = os.path.join(directory, f'.{os.path.basename(path)}.{uuid.uuid4().hex}.tmp')
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for block in blocks:
+                digest.update(block)
+                f.write(block)
+            f.flush()
+            existing, compared = _hash_file(path) if keep_identical else (None, 0)
+            changed = not keep_identical or existing != digest.hexdigest()
+            if changed:
+                os.fsync(f.fileno())
+        if changed:
+            os.replace(tmp_path, path)
+        else:
+            os.remove(tmp_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return digest.hexdigest(), changed, compared
+
+def write_atomic(path, data):
+    """Atomically replace path with the given bytes."""
+    _write_blocks_atomic(path, [data], keep_identical=False)
+
+def write_chunks_atomic(path, chunks):
+    """Stream str chunks to path atomically, leaving an identical file untouched.
+
+    Returns (sha256 hex digest, whether the file changed, bytes read from the
+    existing file to compare it).
+    """
+    # Join small chunks into larger blocks to keep per-call overhead down
+    chunks = iter(chunks)
+    blocks = (
+        ''.join(block).encode('utf-8')
+        for block in iter(lambda: list(itertools.islice(chunks, 1024)), [])
+    )
+    return _write_blocks_atomic(path, blocks, keep_identical=True)
+
+def run_jobs(func, tasks, jobs=1, initializer=None, initargs=()):
+    """Yield func(task) for every task, in task order.
+
+    With jobs > 1 the tasks run on a process pool; results still come back in
+    submission order so logs and output stay identical to a serial run.
+    """
+    if jobs <= 1:
+        if initializer is not None:
+            initializer(*initargs)
+        yield from map(func, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs) as pool:
+        yield from pool.map(func, tasks)
+
+def job_count(value):
+    """argparse type for --jobs; 0 means one job per CPU."""
+    jobs = int(value)
+    if jobs < 0:
+        raise argparse.ArgumentTypeError('--jobs must be >= 0')
+    return jobs or os.cpu_count() or 1
+
+def save_manifest(manifest_path, manifest):
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    data = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True)
+    write_atomic(manifest_path, data.encode('utf-8'))
+
+def locale_items(locale, lang_name, flat_en, machine=None, pruned=frozenset()):
+    """Yield one locale's flat (key, value) pairs in canonical en.json order.
+
+    machine holds provider translations by key; manual translations win over
+    them and English fills whatever is left. pruned lists en.json keys dropped
+    by --prune-unused, so manual translations for them are left out too.
+    """
+    overrides = MANUAL_TRANSLATIONS.get(locale, {})
+
+    # Manual translations where available; otherwise keep English (user can
+    # replace with professional translations). Walking flat_en keeps en.json order.
+    values = ChainMap(overrides, machine or {}, flat_en)
+    extras = [key for key in overrides if key not in flat_en and key not in pruned]
+    yield from canonical_items(flat_en, values, extras)
+
+    # Add metadata
+    yield '_meta.language', lang_name
+    yield '_meta.locale', locale
+    yield '_meta.translation_status', 'partial'
+    yield '_meta.note', 'Contains manual translations for common UI. Other strings need professional translation.'
+
+# Per-process state shared by every locale task (set once per worker)
+_job_state = {}
+
+def is_up_to_date(entry, inputs_hash, output_path):
+    """True if the inputs are unchanged and the file on disk is the one we wrote last time."""
+    if not entry or entry['inputs'] != inputs_hash:
+        return False
+    return file_sha256(output_path) == entry['output']
+
+def _init_job_state(flat_en, translations_dir, minify, pruned, profile=(False, False)):
+    _job_state.update(
+        flat_en=flat_en, translations_dir=translations_dir, minify=minify, pruned=pruned,
+        metrics=StageMetrics(*profile),
+    )
+
+def generate_locale(task):
+    """Build and write one locale.
+
+    Returns (locale, status, manifest_entry, log_lines, metrics) where metrics
+    is this task's StageMetrics snapshot.
+    """
+    locale, lang_name, inputs_hash, machine = task
+    flat_en = _job_state['flat_en']
+    pruned = _job_state['pruned']
+    metrics = _job_state['metrics']
+    output_path = os.path.join(_job_state['translations_dir'], f'{locale}.json')
+    loaded = MANUAL_TRANSLATIONS.bytes_read
+    overrides = MANUAL_TRANSLATIONS.get(locale, {})
+    
+    log = [f"📝 Translating to {lang_name} ({locale})..."]
+    if overrides:
+        log.append(f"   ✓ Using {len(overrides)} manual translations")
+    if machine:
+        log.append(f"   ✓ Using {len(machine)} machine translations")
+    
+    # Stream straight to disk; identical files are left alone so their mtime
+    # (and Flutter's asset cache) survives
+    with metrics.stage('write', locale) as stage:
+        items = locale_items(locale, lang_name, flat_en, machine, pruned)
+        digest, changed, compared = write_chunks_atomic(output_path, iter_json_chunks(items, _job_state['minify']))
+    if metrics.enabled:
+        # Counted outside the timed block so profiling does not skew 'write'
+        machine = machine or {}
+        stage['bytes_read'] = MANUAL_TRANSLATIONS.bytes_read - loaded + compared
+        stage['bytes_written'] = os.path.getsize(output_path) if changed else 0
+        stage['keys'] = len(flat_en) + sum(1 for key in overrides if key not in flat_en and key not in pruned)
+        stage['placeholder_fills'] = sum(1 for key in flat_en if key not in overrides and key not in machine)
+    entry = {
+        'inputs': inputs_hash,
+        'output': digest,
+    }
+    
+    if not changed:
+        log.append(f"   = {locale}.json already up to date")
+        return locale, 'unchanged', entry, log, metrics.take()
+    
+    log.append(f"   ✅ Saved to {locale}.json")
+    return locale, 'rebuilt', entry, log, metrics.take()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Generate PipBox locale files from en.json.')
+    parser.add_argument('--force', action='store_true',
+                        help='rebuild every locale even if its inputs are unchanged')
+    parser.add_argument('--jobs', '-j', type=job_count, default=1, metavar='N',
+                        help='generate locales on N worker processes (0 = one per CPU)')
+    parser.add_argument('--minify', action='store_true',
+                        help='write compact JSON without indentation')
+    parser.add_argument('--bundle', metavar='PATH',
+                        help='also pack all locales into one deduplicated bundle file')
+    parser.add_argument('--locale', type=parse_locale_filter, metavar='LOCALES',
+                        help='only generate these comma-separated locales, e.g. fr,es')
+    parser.add_argument('--prune-unused', action='store_true',
+                        help="leave out en.json keys that no .tr() call in lib/ uses")
+    parser.add_argument('--provider', choices=sorted(PROVIDERS),
+                        help='machine-translate strings without a manual translation')
+    parser.add_argument('--allow-test-provider', action='store_true',
+                        help="testing only: let offline fakes such as 'stub' write into assets/translations")
+    parser.add_argument('--concurrency', type=positive_int, default=4, metavar='N',
+                        help='translation requests in flight at once (default: 4)')
+    parser.add_argument('--batch-size', type=positive_int, default=None, metavar='N',
+                        help="strings per translation request (default: the provider's maximum)")
+    parser.add_argument('--retries', type=non_negative_int, default=3, metavar='N',
+                        help='retries per failed translation request (default: 3)')
+    parser.add_argument('--no-memory', action='store_true',
+                        help=f'do not read or update the translation memory ({CACHE_DIR}/{MEMORY_FILE})')
+    parser.add_argument('--memory-max-entries', type=entry_limit, default=None, metavar='N',
+                        help='evict least recently used translations beyond N entries')
+    parser.add_argument('--memory-max-age-days', type=age_limit, default=None, metavar='DAYS',
+                        help='evict translations unused for DAYS days')
+    add_profile_args(parser)
+    args = parser.parse_args(argv)
+    known = dict(LANGUAGES)
+    unknown = [locale for locale in args.locale or [] if locale not in known]
+    if unknown:
+        parser.error(f"unknown locale(s): {', '.join(unknown)}")
+    if args.provider and PROVIDERS[args.provider].testing and not args.allow_test_provider:
+        parser.error(f"'{args.provider}' is an offline test provider and would write fake strings into the "
+                     f"shipped catalogs; pass --allow-test-provider to use it anyway")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
     script_dir = os.path.dirname(os.path.abspath(__file__))
     translations_dir = os.path.join(script_dir, 'assets', 'translations')
+    manifest_path = os.path.join(script_dir, CACHE_DIR, MANIFEST_FILE)
+    metrics = StageMetrics(*profile_options(args))
     
     # Load English source
     en_path = os.path.join(translations_dir, 'en.json')
-    with open(en_path, 'r', encoding='utf-8') as f:
-        en_data = json.load(f)
+    with metrics.stage('load') as stage:
+        with open(en_path, 'r', encoding='utf-8') as f:
+            en_data = json.load(f)
+        
+        # Flatten for easier processing
+        flat_en = full_en = flatten_dict(en_data)
+        stage['bytes_read'] = os.path.getsize(en_path)
+        stage['keys'] = len(flat_en)
+    pruned = frozenset()
+    if args.prune_unused:
+        from scan_translation_keys import used_key_filter
+        with metrics.stage('prune') as stage:
+            is_used = used_key_filter()
+            pruned = frozenset(key for key in flat_en if not is_used(key))
+            flat_en = {key: value for key, value in flat_en.items() if key not in pruned}
+            stage['keys'] = len(pruned)
     
-    # Flatten for easier processing
-    flat_en = flatten_dict(en_data)
+    manifest = load_manifest(manifest_path)
+    previous = manifest['locales']
+    current = {}
+    results = {'rebuilt': [], 'unchanged': [], 'skipped': []}
+    removed = []
     
     print("🌍 PipBox Translation Generator")
     print("=" * 50)
     print(f"Source: English ({len(flat_en)} strings)")
-    print(f"Generating {len(LANGUAGES)} translations...")
+    if pruned:
+        print(f"✂️  Pruned {len(pruned)} keys not used in lib/")
+    languages = [(locale, lang_name) for locale, lang_name in LANGUAGES
+                 if args.locale is None or locale in args.locale]
+    print(f"Generating {len(languages)} translations...")
+    if args.jobs > 1:
+        print(f"Using {args.jobs} parallel jobs")
     print()
     
-    for locale, lang_name in LANGUAGES:
-        print(f"📝 Translating to {lang_name} ({locale})...")
-        
-        # Start with manual translations if available
-        translated = {}
-        if locale in MANUAL_TRANSLATIONS:
-            translated = MANUAL_TRANSLATIONS[locale].copy()
-            print(f"   ✓ Using {len(translated)} manual translations")
-        
-        # For remaining strings, keep English (user can replace with professional translations)
-        for key, value in flat_en.items():
-            if key not in translated:
-                translated[key] = value  # Placeholder
-        
-        # Convert back to nested structure
-        nested_data = unflatten_dict(translated)
-        
-        # Add metadata
-        nested_data['_meta'] = {
-            'language': lang_name,
-            'locale': locale,
-            'translation_status': 'partial',
-            'note': 'Contains manual translations for common UI. Other strings need professional translation.'
-        }
-        
-        # Write to file
+    stale = []
+    for locale, lang_name in languages:
+        with metrics.stage('check', locale) as stage:
+            loaded = MANUAL_TRANSLATIONS.bytes_read
+            overrides = MANUAL_TRANSLATIONS.get(locale, {})
+            inputs_hash = hash_locale_inputs(flat_en, overrides, lang_name, args.minify, args.provider, pruned)
+            output_path = os.path.join(translations_dir, f'{locale}.json')
+            entry = previous.get(locale)
+            fresh = not args.force and is_up_to_date(entry, inputs_hash, output_path)
+            stage['bytes_read'] = MANUAL_TRANSLATIONS.bytes_read - loaded
+            if not args.force and entry and entry['inputs'] == inputs_hash:
+                # is_up_to_date hashed the output whether or not it still matched
+                stage['bytes_read'] += file_size(output_path)
+            stage['keys'] = len(overrides)
+        if fresh:
+            current[locale] = previous[locale]
+            results['skipped'].append(locale)
+        else:
+            stale.append((locale, lang_name, inputs_hash))
+    
+    # Only locales that are actually being rebuilt cost translation requests,
+    # and only for strings the translation memory has not seen before
+    machine = {}
+    incomplete = set()
+    if args.provider and stale:
+        provider = get_provider(args.provider)
+        targets = [(locale, lang_name, MANUAL_TRANSLATIONS.get(locale, {})) for locale, lang_name, _ in stale]
+        memory = None
+        if not args.no_memory:
+            memory = TranslationMemory(
+                os.path.join(script_dir, CACHE_DIR, MEMORY_FILE),
+                max_entries=args.memory_max_entries, max_age_days=args.memory_max_age_days,
+            )
+            # Sync against the unpruned catalog so pruned keys keep their cached translations
+            changed = memory.sync_sources(full_en)
+            if changed:
+                print(f"🧠 English changed for {len(changed)} keys; their old translations were dropped")
+        try:
+            with metrics.stage('translate') as stage:
+                machine, stats = translate_catalogs(
+                    provider, flat_en, targets,
+                    concurrency=args.concurrency, batch_size=args.batch_size, retries=args.retries,
+                    memory=memory,
+                )
+                stage['keys'] = stats['keys']
+            if memory is not None:
+                memory.evict()
+                print(f"🧠 Translation memory: {memory.hits} hits, {memory.misses} misses")
+        finally:
+            if memory is not None:
+                memory.close()
+        print(f"🤖 {provider.name}: {stats['strings']} unique strings in {stats['batches']} batches, "
+              f"{stats['requests']} requests ({stats['retries']} retries) in {stats['elapsed']:.2f}s")
+        for error in stats['errors']:
+            print(f"   ⚠️  {error} (kept English)")
+        incomplete = stats['incomplete']
+        print()
+    
+    tasks = [(locale, lang_name, inputs_hash, machine.get(locale)) for locale, lang_name, inputs_hash in stale]
+    for locale, status, entry, log, task_metrics in run_jobs(
+        generate_locale, tasks, args.jobs,
+        initializer=_init_job_state,
+        initargs=(flat_en, translations_dir, args.minify, pruned, profile_options(args)),
+    ):
+        for line in log:
+            print(line)
+        if locale in incomplete:
+            # Some strings fell back to English; leave the inputs unrecorded so
+            # the next run retries them instead of skipping the locale
+            entry = {**entry, 'inputs': None}
+        current[locale] = entry
+        results[status].append(locale)
+        metrics.merge(task_metrics)
+    
+    # Locales outside --locale keep their previous manifest entries
+    for locale in previous:
+        if locale in dict(LANGUAGES) and locale not in current:
+            current[locale] = previous[locale]
+    
+    # Drop files for locales that were generated before but are no longer listed
+    for locale in sorted(set(previous) - set(current)):
         output_path = os.path.join(translations_dir, f'{locale}.json')
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(nested_data, f, ensure_ascii=False, indent=2)
-        
-        print(f"   ✅ Saved to {locale}.json")
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        removed.append(locale)
+        print(f"🗑  Removed {locale}.json (no longer in LANGUAGES)")
+    
+    manifest['locales'] = current
+    with metrics.stage('manifest') as stage:
+        save_manifest(manifest_path, manifest)
+        stage['bytes_written'] = os.path.getsize(manifest_path)
     
+    if args.bundle:
+        from translation_bundle import write_bundle
+        with metrics.stage('bundle') as stage:
+            size, catalogs = write_bundle(translations_dir, args.bundle)
+            stage['bytes_written'] = size
+        print(f"📦 Bundled {len(catalogs)} locales into {args.bundle} ({size} bytes)")
+    
+    rebuilt = results['rebuilt']
     print()
     print("=" * 50)
     print("✨ Translation generation complete!")
+    print(f"   Rebuilt:   {len(rebuilt)}" + (f" ({', '.join(rebuilt)})" if rebuilt else ""))
+    print(f"   Unchanged: {len(results['unchanged'])} (identical output, not rewritten)")
+    print(f"   Skipped:   {len(results['skipped'])} (inputs unchanged)")
+    print(f"   Removed:   {len(removed)}" + (f" ({', '.join(removed)})" if removed else ""))
     print()
-    print("📢 Next steps:")
-    print("   1. Review generated translations")
-    print("   2. Replace placeholder English text with professional translations")
-    print("   3. Test app with different languages")
-    print()
+    if rebuilt:
+        print("📢 Next steps:")
+        print("   1. Review generated translations")
+        print("   2. Replace placeholder English text with professional translations")
+        print("   3. Test app with different languages")
+        print()
+    publish(
+        metrics, args, 'generate_translations',
+        jobs=args.jobs, minify=args.minify, provider=args.provider, force=args.force,
+        results={status: len(locales) for status, locales in results.items()},
+    )
 
 if __name__ == '__main__':
     main()
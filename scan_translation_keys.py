@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Translation Key Usage Index for PipBox
+Finds every `'key'.tr()` / `tr('key')` lookup in lib/**/*.dart and links it to en.json.
+The inverted index is cached in .translation_cache/key_index.json; only files
+whose mtime or size changed are re-scanned.
+"""
+
+import argparse
+import bisect
+import json
+import os
+import re
+import sys
+
+from generate_translations import CACHE_DIR, flatten_dict, write_atomic
+
+INDEX_FILE = 'key_index.json'
+INDEX_VERSION = 1
+
+# 'key'.tr(), "key".plural(n) and tr('key'), plural('key', n), context.tr('key')
+_LITERAL = r'''(['"])([^'"\n]+)\1'''
+LOOKUP_RES = [
+    re.compile(_LITERAL + r'\s*\.\s*(?:tr|plural)\('),
+    re.compile(r'\b(?:tr|plural)\(\s*' + _LITERAL),
+]
+
+def scan_source(text):
+    """Return {key: [line, ...]} for the lookups in one Dart file.
+
+    Keys built with interpolation ('onboarding.useCase.$id') are recorded up to
+    the first `$`, ending in '*', so callers can treat them as prefixes.
+    """
+    newlines = [i for i, char in enumerate(text) if char == '\n']
+    found = {}
+    for pattern in LOOKUP_RES:
+        for match in pattern.finditer(text):
+            key = match.group(2)
+            if '$' in key:
+                key = key[:key.index('$')] + '*'
+            line = bisect.bisect_left(newlines, match.start()) + 1
+            found.setdefault(key, []).append(line)
+    for lines in found.values():
+        lines.sort()
+    return found
+
+def load_index(index_path):
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {'version': INDEX_VERSION, 'files': {}}
+    if index.get('version') != INDEX_VERSION:
+        return {'version': INDEX_VERSION, 'files': {}}
+    return index
+
+def update_index(lib_dir, index_path):
+    """Re-scan changed Dart files and return (usages, stats).
+
+    usages maps each key to a sorted list of 'path:line' strings.
+    """
+    index = load_index(index_path)
+    cached_files = index['files']
+    files = {}
+    stats = {'scanned': 0, 'cached': 0, 'removed': 0}
+    root = os.path.dirname(os.path.abspath(lib_dir))
+    for directory, _, names in os.walk(lib_dir):
+        for name in names:
+            if not name.endswith('.dart'):
+                continue
+            path = os.path.join(directory, name)
+            relpath = os.path.relpath(path, root).replace(os.sep, '/')
+            st = os.stat(path)
+            entry = cached_files.get(relpath)
+            if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+                files[relpath] = entry
+                stats['cached'] += 1
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                keys = scan_source(f.read())
+            files[relpath] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'keys': keys}
+            stats['scanned'] += 1
+    stats['removed'] = len(set(cached_files) - set(files))
+
+    if stats['scanned'] or stats['removed'] or not os.path.exists(index_path):
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        data = json.dumps({'version': INDEX_VERSION, 'files': files}, ensure_ascii=False, sort_keys=True)
+        write_atomic(index_path, data.encode('utf-8'))
+
+    usages = {}
+    for relpath in sorted(files):
+        for key, lines in files[relpath]['keys'].items():
+            usages.setdefault(key, []).extend(f'{relpath}:{line}' for line in lines)
+    return usages, stats
+
+def split_usages(usages):
+    """Separate exact keys from dynamic prefixes ('a.b.*' -> 'a.b.')."""
+    exact = {key for key in usages if not key.endswith('*')}
+    prefixes = tuple(sorted(key[:-1] for key in usages if key.endswith('*')))
+    return exact, prefixes
+
+def key_filter(usages, keep=()):
+    """Predicate telling whether a catalog key is (possibly) used by the app."""
+    exact, prefixes = split_usages(usages)
+    prefixes += tuple(keep)
+    return lambda key: key in exact or key.startswith(prefixes)
+
+def missing_keys(usages, flat_en):
+    """Keys the code looks up that en.json does not define."""
+    exact, prefixes = split_usages(usages)
+    missing = sorted(key for key in exact if key not in flat_en)
+    missing += sorted(
+        f'{prefix}*' for prefix in prefixes
+        if not any(key.startswith(prefix) for key in flat_en)
+    )
+    return missing
+
+def default_paths():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return (
+        os.path.join(script_dir, 'lib'),
+        os.path.join(script_dir, CACHE_DIR, INDEX_FILE),
+        os.path.join(script_dir, 'assets', 'translations', 'en.json'),
+    )
+
+def used_key_filter(keep=()):
+    """Key filter for the generators' --prune-unused, built from the cached index."""
+    lib_dir, index_path, _ = default_paths()
+    usages, _ = update_index(lib_dir, index_path)
+    return key_filter(usages, keep)
+
+def parse_args(argv=None):
+    lib_dir, index_path, en_path = default_paths()
+    parser = argparse.ArgumentParser(description='Index translation key usages in lib/**/*.dart.')
+    parser.add_argument('--lib', default=lib_dir, help='Dart source directory')
+    parser.add_argument('--index', default=index_path, help='cached usage index')
+    parser.add_argument('--en', default=en_path, help='English catalog')
+    parser.add_argument('--unused', action='store_true', help='list en.json keys the code never uses')
+    parser.add_argument('--json', action='store_true', help='print the full report as JSON')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    usages, stats = update_index(args.lib, args.index)
+    with open(args.en, 'r', encoding='utf-8') as f:
+        flat_en = flatten_dict(json.load(f))
+    missing = missing_keys(usages, flat_en)
+    is_used = key_filter(usages)
+    unused = [key for key in flat_en if not is_used(key)]
+
+    if args.json:
+        json.dump({
+            'stats': stats,
+            'usages': usages,
+            'missing': {key: usages[key] for key in missing},
+            'unused': unused,
+        }, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print("🔎 PipBox Translation Key Usage")
+        print("=" * 50)
+        print(f"Dart files: {stats['scanned']} scanned, {stats['cached']} cached, {stats['removed']} removed")
+        print(f"Keys used:  {len(usages)}  |  en.json keys: {len(flat_en)}  |  unused: {len(unused)}")
+        for key in missing:
+            print(f"❌ '{key}' is used but missing from en.json ({', '.join(usages[key])})")
+        if args.unused:
+            for key in unused:
+                print(f"   unused: {key}")
+        if not missing:
+            print("✅ Every key used in lib/ exists in en.json")
+    return 1 if missing else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
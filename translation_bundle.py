@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Compact Translation Bundle for PipBox
+Packs every locale in assets/translations into one deduplicated, memory-mappable file.
+
+Layout (little-endian, every section 4-byte aligned):
+    header      magic 'PBXB', version, string/key/locale counts, blob offset, blob size
+    strings     string_count x (offset u32, length u32) into the UTF-8 blob
+    keys        key_count x string id (dot-notation key names, en.json order)
+    locales     locale_count x string id
+    values      locale_count x key_count x string id (MISSING when absent)
+    blob        interned UTF-8 strings, each stored once
+"""
+
+import argparse
+import glob
+import json
+import mmap
+import os
+import struct
+import time
+
+from generate_translations import flatten_dict, write_atomic
+
+MAGIC = b'PBXB'
+VERSION = 1
+HEADER = struct.Struct('<4sIIIIII4x')
+MISSING = 0xFFFFFFFF
+SOURCE_LOCALE = 'en'
+# Generator bookkeeping (language name, status note); the app never looks these up
+META_PREFIX = '_meta.'
+
+def load_catalogs(translations_dir):
+    """Load every <locale>.json as a flat dict, English first, then by locale name.
+
+    The generators' _meta entries are left out.
+    """
+    paths = sorted(glob.glob(os.path.join(translations_dir, '*.json')))
+    catalogs = {}
+    for path in paths:
+        locale = os.path.splitext(os.path.basename(path))[0]
+        with open(path, 'r', encoding='utf-8') as f:
+            catalogs[locale] = {
+                key: value for key, value in flatten_dict(json.load(f)).items()
+                if not key.startswith(META_PREFIX)
+            }
+    if SOURCE_LOCALE in catalogs:
+        catalogs = {SOURCE_LOCALE: catalogs.pop(SOURCE_LOCALE), **catalogs}
+    return catalogs
+
+def encode_bundle(catalogs):
+    """Serialize {locale: flat_catalog} into bundle bytes."""
+    strings = {}
+
+    def intern(text):
+        if not isinstance(text, str):
+            raise ValueError(f'bundle values must be strings, got {type(text).__name__}: {text!r}')
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    keys = {}
+    for catalog in catalogs.values():
+        for key in catalog:
+            keys.setdefault(key, len(keys))
+
+    key_ids = [intern(key) for key in keys]
+    locale_ids = [intern(locale) for locale in catalogs]
+    values = []
+    for catalog in catalogs.values():
+        values.extend(intern(catalog[key]) if key in catalog else MISSING for key in keys)
+
+    index = []
+    blob = bytearray()
+    for text in strings:
+        encoded = text.encode('utf-8')
+        index += (len(blob), len(encoded))
+        blob += encoded
+
+    tables = struct.pack(f'<{len(index)}I', *index)
+    tables += struct.pack(f'<{len(key_ids)}I', *key_ids)
+    tables += struct.pack(f'<{len(locale_ids)}I', *locale_ids)
+    tables += struct.pack(f'<{len(values)}I', *values)
+    blob_offset = HEADER.size + len(tables)
+    header = HEADER.pack(MAGIC, VERSION, len(strings), len(keys), len(catalogs), blob_offset, len(blob))
+    return header + tables + bytes(blob)
+
+def write_bundle(translations_dir, bundle_path):
+    """Build a bundle from the locale files on disk; returns (bytes_written, catalogs)."""
+    catalogs = load_catalogs(translations_dir)
+    data = encode_bundle(catalogs)
+    directory = os.path.dirname(bundle_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    write_atomic(bundle_path, data)
+    return len(data), catalogs
+
+class TranslationBundle:
+    """Read-only, memory-mapped view of a bundle written by encode_bundle()."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError(f'{path}: not a translation bundle')
+        if len(self._mm) < HEADER.size:
+            self.close()
+            raise ValueError(f'{path}: not a translation bundle')
+        magic, version, string_count, key_count, locale_count, blob_offset, blob_size = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f'{path}: unsupported bundle (magic {magic!r}, version {version})')
+        self.string_count = string_count
+        self.key_count = key_count
+        self.locale_count = locale_count
+        self._strings_offset = HEADER.size
+        self._keys_offset = self._strings_offset + 8 * string_count
+        self._locales_offset = self._keys_offset + 4 * key_count
+        self._values_offset = self._locales_offset + 4 * locale_count
+        self._blob_offset = blob_offset
+        if self._values_offset + 4 * locale_count * key_count != blob_offset or blob_offset + blob_size != len(self._mm):
+            self.close()
+            raise ValueError(f'{path}: truncated or corrupt bundle')
+        self._string_index = None
+        self._decoded = {}
+        self._keys = None
+        self._key_index = None
+        self._locales = None
+        self._locale_index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if getattr(self, '_mm', None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def string(self, string_id):
+        # Strings are shared across locales, so each one is decoded only once
+        text = self._decoded.get(string_id)
+        if text is None:
+            if self._string_index is None:
+                self._string_index = self._ids(self._strings_offset, 2 * self.string_count)
+            offset = self._blob_offset + self._string_index[2 * string_id]
+            text = self._mm[offset:offset + self._string_index[2 * string_id + 1]].decode('utf-8')
+            self._decoded[string_id] = text
+        return text
+
+    def _ids(self, offset, count):
+        return struct.unpack_from(f'<{count}I', self._mm, offset)
+
+    def _load_tables(self):
+        """Decode the key and locale tables once, on first use."""
+        if self._keys is None:
+            self._keys = [self.string(i) for i in self._ids(self._keys_offset, self.key_count)]
+            self._key_index = {key: i for i, key in enumerate(self._keys)}
+            self._locales = [self.string(i) for i in self._ids(self._locales_offset, self.locale_count)]
+            self._locale_index = {locale: i for i, locale in enumerate(self._locales)}
+
+    @property
+    def keys(self):
+        self._load_tables()
+        return list(self._keys)
+
+    @property
+    def locales(self):
+        self._load_tables()
+        return list(self._locales)
+
+    def get(self, locale, key, default=None):
+        self._load_tables()
+        row = self._locale_index.get(locale)
+        column = self._key_index.get(key)
+        if row is None or column is None:
+            return default
+        (string_id,) = struct.unpack_from('<I', self._mm, self._values_offset + 4 * (row * self.key_count + column))
+        return default if string_id == MISSING else self.string(string_id)
+
+    def catalog(self, locale):
+        """Decode one locale back into a flat {key: text} dict."""
+        self._load_tables()
+        row = self._locale_index.get(locale)
+        if row is None:
+            raise KeyError(locale)
+        ids = self._ids(self._values_offset + 4 * row * self.key_count, self.key_count)
+        strings = self._all_strings()
+        return {key: strings[i] for key, i in zip(self._keys, ids) if i != MISSING}
+
+    def _all_strings(self):
+        """Decode the whole string table once, for whole-catalog reads."""
+        if len(self._decoded) < self.string_count:
+            if self._string_index is None:
+                self._string_index = self._ids(self._strings_offset, 2 * self.string_count)
+            blob = self._mm[self._blob_offset:]
+            index = self._string_index
+            self._decoded = {
+                i: blob[index[2 * i]:index[2 * i] + index[2 * i + 1]].decode('utf-8')
+                for i in range(self.string_count)
+            }
+        return self._decoded
+
+def check_bundle(bundle_path, catalogs):
+    """Return a list of differences between a bundle and the source catalogs."""
+    problems = []
+    with TranslationBundle(bundle_path) as bundle:
+        locales = bundle.locales
+        if locales != list(catalogs):
+            problems.append(f'locales differ: bundle {locales}, sources {list(catalogs)}')
+        for locale in catalogs:
+            if locale in locales and bundle.catalog(locale) != catalogs[locale]:
+                problems.append(f'{locale}: decoded strings differ from {locale}.json')
+    return problems
+
+def _time(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def layout_report(translations_dir, bundle_path):
+    """Compare size and parse time of the per-locale JSON files, minified JSON and the bundle."""
+    paths = sorted(glob.glob(os.path.join(translations_dir, '*.json')))
+    raw = {}
+    for path in paths:
+        with open(path, 'rb') as f:
+            raw[path] = f.read()
+    minified = {
+        path: json.dumps(json.loads(data), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        for path, data in raw.items()
+    }
+
+    def parse_all(files):
+        for data in files.values():
+            json.loads(data)
+
+    def decode_bundle():
+        with TranslationBundle(bundle_path) as bundle:
+            for locale in bundle.locales:
+                bundle.catalog(locale)
+
+    rows = [
+        ('Per-locale JSON (current)', sum(map(len, raw.values())), len(raw), _time(lambda: parse_all(raw))),
+        ('Per-locale JSON (minified)', sum(map(len, minified.values())), len(minified), _time(lambda: parse_all(minified))),
+        ('Deduplicated bundle', os.path.getsize(bundle_path), 1, _time(decode_bundle)),
+    ]
+    baseline = rows[0][1]
+    lines = [f"{'Layout':<28} {'Files':>5} {'Bytes':>9} {'vs now':>7} {'Parse all':>10}"]
+    for name, size, files, seconds in rows:
+        lines.append(f"{name:<28} {files:>5} {size:>9} {size / baseline:>6.0%} {seconds * 1000:>8.2f}ms")
+    return '\n'.join(lines)
+
+def parse_args(argv=None):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='Build, check or measure the compact translation bundle.')
+    parser.add_argument('command', choices=['build', 'check', 'report'])
+    parser.add_argument('bundle', help='bundle file path')
+    parser.add_argument('--dir', default=os.path.join(script_dir, 'assets', 'translations'),
+                        help='directory holding <locale>.json files')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.command == 'build':
+        size, catalogs = write_bundle(args.dir, args.bundle)
+        print(f"📦 Bundled {len(catalogs)} locales into {args.bundle} ({size} bytes)")
+        return 0
+
+    catalogs = load_catalogs(args.dir)
+    if args.command == 'check':
+        try:
+            problems = check_bundle(args.bundle, catalogs)
+        except (OSError, ValueError) as e:
+            problems = [str(e)]
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            return 1
+        print(f"✅ {args.bundle} matches {len(catalogs)} locale files")
+        return 0
+
+    print(layout_report(args.dir, args.bundle))
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
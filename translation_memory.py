@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Translation Memory for PipBox
+On-disk (SQLite) cache of past machine translations, keyed by
+(source-string hash, target locale, provider), so re-runs only pay for new strings.
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import time
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS memory (
+    source_hash TEXT NOT NULL,
+    locale      TEXT NOT NULL,
+    provider    TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    created     REAL NOT NULL,
+    last_used   REAL NOT NULL,
+    PRIMARY KEY (source_hash, locale, provider)
+);
+CREATE INDEX IF NOT EXISTS memory_last_used ON memory (last_used);
+CREATE TABLE IF NOT EXISTS sources (
+    key         TEXT PRIMARY KEY,
+    source_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+'''
+
+# SQLite's default limit on host parameters per statement is 999 on older builds
+_CHUNK = 500
+
+def source_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def entry_limit(value):
+    """argparse type for --max-entries (>= 0)."""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f'must be >= 0, got {number}')
+    return number
+
+def age_limit(value):
+    """argparse type for --max-age-days (>= 0)."""
+    number = float(value)
+    if not number >= 0:
+        raise argparse.ArgumentTypeError(f'must be >= 0, got {value}')
+    return number
+
+def _chunks(items, size=_CHUNK):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+class TranslationMemory:
+    """Persistent translation cache with LRU/age eviction and hit/miss counters."""
+
+    def __init__(self, path, max_entries=None, max_age_days=None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._db = sqlite3.connect(path)
+        self._db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._db is not None:
+            self._bump_counters()
+            self._db.close()
+            self._db = None
+
+    def lookup(self, texts, locale, provider):
+        """Return {text: translation} for every text already in memory."""
+        by_hash = {source_hash(text): text for text in texts}
+        found = {}
+        for chunk in _chunks(list(by_hash)):
+            rows = self._db.execute(
+                f'SELECT source_hash, translation FROM memory '
+                f'WHERE locale = ? AND provider = ? AND source_hash IN ({",".join("?" * len(chunk))})',
+                [locale, provider, *chunk],
+            )
+            for digest, translation in rows:
+                found[by_hash[digest]] = translation
+        if found:
+            now = time.time()
+            with self._db:
+                self._db.executemany(
+                    'UPDATE memory SET last_used = ? WHERE source_hash = ? AND locale = ? AND provider = ?',
+                    [(now, source_hash(text), locale, provider) for text in found],
+                )
+        self.hits += len(found)
+        self.misses += len(by_hash) - len(found)
+        return found
+
+    def store(self, translations, locale, provider):
+        """Record {text: translation} results for locale and provider."""
+        now = time.time()
+        with self._db:
+            self._db.executemany(
+                'INSERT OR REPLACE INTO memory '
+                '(source_hash, locale, provider, source, translation, created, last_used) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(source_hash(text), locale, provider, text, translation, now, now)
+                 for text, translation in translations.items()],
+            )
+
+    def sync_sources(self, flat_en):
+        """Track the English text behind every key and drop translations of replaced text.
+
+        Returns the keys whose English source changed since the last sync.
+        Translations of the old text are removed unless another key still uses it.
+        """
+        current = {key: source_hash(value) for key, value in flat_en.items() if isinstance(value, str)}
+        previous = dict(self._db.execute('SELECT key, source_hash FROM sources'))
+        changed = [key for key, digest in current.items() if key in previous and previous[key] != digest]
+        orphaned = set(previous.values()) - set(current.values())
+        with self._db:
+            self._db.execute('DELETE FROM sources')
+            self._db.executemany('INSERT INTO sources (key, source_hash) VALUES (?, ?)', current.items())
+            for chunk in _chunks(sorted(orphaned)):
+                self._db.execute(
+                    f'DELETE FROM memory WHERE source_hash IN ({",".join("?" * len(chunk))})', chunk,
+                )
+        return changed
+
+    def evict(self, max_entries=None, max_age_days=None):
+        """Drop entries unused for max_age_days, then least recently used ones beyond max_entries."""
+        max_entries = self.max_entries if max_entries is None else max_entries
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+        # SQLite reads a negative OFFSET as 0 and a negative age puts the cutoff
+        # in the future; either would wipe the whole memory
+        if max_entries is not None and max_entries < 0:
+            raise ValueError(f'max_entries must be >= 0, got {max_entries}')
+        if max_age_days is not None and not max_age_days >= 0:
+            raise ValueError(f'max_age_days must be >= 0, got {max_age_days}')
+        removed = 0
+        with self._db:
+            if max_age_days is not None:
+                cutoff = time.time() - max_age_days * 86400
+                removed += self._db.execute('DELETE FROM memory WHERE last_used < ?', (cutoff,)).rowcount
+            if max_entries is not None:
+                removed += self._db.execute(
+                    'DELETE FROM memory WHERE rowid IN '
+                    '(SELECT rowid FROM memory ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+                    (max_entries,),
+                ).rowcount
+        if removed:
+            # Give the freed pages back so size limits show up on disk too
+            self._db.execute('VACUUM')
+        return removed
+
+    def clear(self):
+        with self._db:
+            self._db.execute('DELETE FROM memory')
+            self._db.execute('DELETE FROM sources')
+            self._db.execute('DELETE FROM counters')
+        self.hits = self.misses = 0
+
+    def _bump_counters(self):
+        if not (self.hits or self.misses):
+            return
+        with self._db:
+            for name, value in (('hits', self.hits), ('misses', self.misses)):
+                self._db.execute(
+                    'INSERT INTO counters (name, value) VALUES (?, ?) '
+                    'ON CONFLICT(name) DO UPDATE SET value = value + excluded.value',
+                    (name, value),
+                )
+        self.hits = self.misses = 0
+
+    def stats(self):
+        """Entry counts and cumulative hit/miss totals (including this session)."""
+        self._bump_counters()
+        counters = dict(self._db.execute('SELECT name, value FROM counters'))
+        per_locale = dict(self._db.execute('SELECT locale, COUNT(*) FROM memory GROUP BY locale ORDER BY locale'))
+        hits, misses = counters.get('hits', 0), counters.get('misses', 0)
+        return {
+            'entries': sum(per_locale.values()),
+            'locales': per_locale,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 3) if hits + misses else None,
+            'size_bytes': os.path.getsize(self.path),
+        }
+
+def parse_args(argv=None):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='Inspect or maintain the translation memory.')
+    parser.add_argument('command', choices=['stats', 'evict', 'clear'])
+    parser.add_argument('--memory', default=os.path.join(script_dir, '.translation_cache', 'memory.sqlite3'),
+                        help='translation memory database')
+    parser.add_argument('--max-entries', type=entry_limit, default=None)
+    parser.add_argument('--max-age-days', type=age_limit, default=None)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    with TranslationMemory(args.memory) as memory:
+        if args.command == 'evict':
+            removed = memory.evict(args.max_entries, args.max_age_days)
+            print(f"🧹 Evicted {removed} entries")
+        elif args.command == 'clear':
+            memory.clear()
+            print("🧹 Translation memory cleared")
+        stats = memory.stats()
+    print(f"🧠 {stats['entries']} entries, {stats['size_bytes']} bytes")
+    print(f"   Hits: {stats['hits']}  Misses: {stats['misses']}"
+          + (f"  Hit rate: {stats['hit_rate']:.1%}" if stats['hit_rate'] is not None else ""))
+    for locale, count in stats['locales'].items():
+        print(f"   {locale:<8} {count}")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
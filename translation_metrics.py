@@ -0,0 +1,185 @@
+"""
+Generator Metrics for PipBox
+Per-stage, per-locale measurements for the translation generators: wall time,
+CPU time, bytes read and written, key counts, placeholder fills (keys left on
+the English text) and peak Python memory, plus optional cProfile capture.
+
+Everything is off unless --profile, --metrics-json or --cprofile is given;
+a disabled recorder only hands out throwaway counter dicts. Memory tracing
+slows a run down, so compare timings only against other profiled runs.
+"""
+
+import cProfile
+import json
+import platform
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+COUNTERS = ['bytes_read', 'bytes_written', 'keys', 'placeholder_fills']
+
+class _CapturedProfile:
+    """Feeds raw cProfile stats collected in a worker back into pstats.Stats."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+class StageMetrics:
+    """Records one entry per stage run, optionally tagged with a locale.
+
+    Worker processes keep their own recorder and hand their entries back
+    with take(); the main process folds them in with merge().
+    """
+
+    def __init__(self, enabled=False, cprofile=False):
+        self.enabled = enabled or cprofile
+        self.cprofile = cprofile
+        self.records = []
+        self.profiles = []
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name, locale=None):
+        """Measure the enclosed block; the yielded dict takes the COUNTERS."""
+        record = dict.fromkeys(COUNTERS, 0)
+        if not self.enabled:
+            yield record
+            return
+        tracemalloc.reset_peak()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        profiler = cProfile.Profile() if self.cprofile else None
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.create_stats()
+                self.profiles.append(profiler.stats)
+            record.update(
+                stage=name,
+                locale=locale,
+                wall_seconds=round(time.perf_counter() - start, 6),
+                cpu_seconds=round(time.process_time() - cpu_start, 6),
+                peak_bytes=max(0, tracemalloc.get_traced_memory()[1] - memory_before),
+            )
+            self.records.append(record)
+
+    def take(self):
+        """Hand over (and forget) everything recorded so far, e.g. from a worker."""
+        snapshot = (self.records, self.profiles)
+        self.records, self.profiles = [], []
+        return snapshot
+
+    def merge(self, snapshot):
+        records, profiles = snapshot
+        self.records.extend(records)
+        self.profiles.extend(profiles)
+
+    def summary(self):
+        """{stage: totals} in first-seen order; peak_bytes is the largest single run."""
+        stages = {}
+        for record in self.records:
+            total = stages.setdefault(record['stage'], {
+                'runs': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'peak_bytes': 0, **dict.fromkeys(COUNTERS, 0),
+            })
+            total['runs'] += 1
+            total['wall_seconds'] = round(total['wall_seconds'] + record['wall_seconds'], 6)
+            total['cpu_seconds'] = round(total['cpu_seconds'] + record['cpu_seconds'], 6)
+            total['peak_bytes'] = max(total['peak_bytes'], record['peak_bytes'])
+            for counter in COUNTERS:
+                total[counter] += record[counter]
+        return stages
+
+    def report(self, script, **info):
+        """JSON-ready report: run-wide stages, per-locale stages and stage totals."""
+        run = []
+        locales = {}
+        for record in self.records:
+            entry = {key: value for key, value in record.items() if key not in ('stage', 'locale')}
+            if record['locale'] is None:
+                run.append({'stage': record['stage'], **entry})
+            else:
+                locales.setdefault(record['locale'], {})[record['stage']] = entry
+        return {
+            'script': script,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            **info,
+            'wall_seconds': round(time.perf_counter() - self.started, 6),
+            'main_cpu_seconds': round(time.process_time() - self.cpu_started, 6),
+            'stages': self.summary(),
+            'run': run,
+            'locales': dict(sorted(locales.items())),
+        }
+
+    def write_json(self, path, script, **info):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(script, **info), f, ensure_ascii=False, indent=2)
+
+    def dump_profile(self, path):
+        """Write the combined cProfile stats of every stage (python -m pstats PATH)."""
+        if not self.profiles:
+            return False
+        stats = pstats.Stats(_CapturedProfile(self.profiles[0]))
+        for profile in self.profiles[1:]:
+            stats.add(_CapturedProfile(profile))
+        stats.dump_stats(path)
+        return True
+
+    def format_summary(self, slowest=5):
+        """Per-stage table plus the locales that took longest, for CI logs."""
+        lines = [f"{'Stage':<12} {'Runs':>5} {'Wall':>9} {'CPU':>9} {'Read KiB':>9} {'Write KiB':>9} "
+                 f"{'Keys':>8} {'Fills':>8} {'Peak MiB':>9}"]
+        for stage, total in self.summary().items():
+            lines.append(
+                f"{stage:<12} {total['runs']:>5} {total['wall_seconds'] * 1000:>7.1f}ms "
+                f"{total['cpu_seconds'] * 1000:>7.1f}ms {total['bytes_read'] / 1024:>9.1f} "
+                f"{total['bytes_written'] / 1024:>9.1f} {total['keys']:>8} {total['placeholder_fills']:>8} "
+                f"{total['peak_bytes'] / 2 ** 20:>9.2f}"
+            )
+        per_locale = {}
+        for record in self.records:
+            if record['locale'] is not None:
+                per_locale[record['locale']] = per_locale.get(record['locale'], 0) + record['wall_seconds']
+        if per_locale:
+            ranked = sorted(per_locale.items(), key=lambda item: item[1], reverse=True)[:slowest]
+            lines.append('Slowest locales: ' + ', '.join(f'{locale} {seconds * 1000:.1f}ms' for locale, seconds in ranked))
+        return '\n'.join(lines)
+
+def add_profile_args(parser):
+    """Add --profile, --metrics-json and --cprofile to a generator's parser."""
+    parser.add_argument('--profile', action='store_true',
+                        help='print per-stage time, I/O, key counts and peak memory after the run')
+    parser.add_argument('--metrics-json', metavar='PATH',
+                        help='write per-locale, per-stage metrics as JSON')
+    parser.add_argument('--cprofile', metavar='PATH',
+                        help='dump cProfile stats of every stage (view with python -m pstats PATH)')
+
+def profile_options(args):
+    """(enabled, cprofile) for StageMetrics, picklable for worker initializers."""
+    return bool(args.profile or args.metrics_json), bool(args.cprofile)
+
+def publish(metrics, args, script, **info):
+    """Print and/or save what the metrics options asked for."""
+    if not metrics.enabled:
+        return
+    if args.profile:
+        print("⏱  Stage metrics")
+        print(metrics.format_summary())
+    if args.metrics_json:
+        metrics.write_json(args.metrics_json, script, **info)
+        print(f"📊 Metrics written to {args.metrics_json}")
+    if args.cprofile and metrics.dump_profile(args.cprofile):
+        print(f"📊 cProfile stats written to {args.cprofile}")
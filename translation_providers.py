@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Translation Providers for PipBox
+Pluggable machine-translation backends plus the batched asyncio pipeline that drives them.
+
+Source strings are deduplicated before anything is sent (`common.close` and
+`menu.close` are both "Close"), grouped into batches, and sent with a bounded
+number of requests in flight, a per-provider rate limit and retry with backoff.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+class TranslationError(Exception):
+    """A provider failed to translate a batch."""
+
+    def __init__(self, message, retryable=False):
+        super().__init__(message)
+        self.retryable = retryable
+
+class RateLimiter:
+    """Token bucket allowing `rate` requests per second, in bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class TranslationProvider:
+    """Base class for translation backends.
+
+    Subclasses implement translate_batch() and may tune the class attributes:
+    max_batch_size caps strings per request, rate_limit caps requests per
+    second (None for unlimited) and burst sets how many may go out at once.
+    testing marks fakes whose output must never be shipped.
+
+    translate_batch() signals failures with TranslationError; OSError and
+    asyncio.TimeoutError from the transport are retried like retryable
+    TranslationErrors. Anything else aborts the run.
+    """
+
+    name = 'base'
+    testing = False
+    max_batch_size = 50
+    rate_limit = None
+    burst = 1
+
+    async def translate_batch(self, texts, locale, lang_name):
+        """Return one translation per entry in texts, in the same order."""
+        raise NotImplementedError
+
+class StubProvider(TranslationProvider):
+    """In-process fake for offline runs: tags each string with its locale.
+
+    latency simulates a network round trip and failure_rate makes a share of
+    requests fail with a retryable error, so batching, concurrency limits and
+    retries can be exercised without a real backend.
+    """
+
+    name = 'stub'
+    testing = True
+
+    def __init__(self, latency=0.0, failure_rate=0.0, max_batch_size=50, rate_limit=None, burst=1, seed=0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.max_batch_size = max_batch_size
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self._random = random.Random(seed)
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def translate_batch(self, texts, locale, lang_name):
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if self._random.random() < self.failure_rate:
+                raise TranslationError(f'stub: simulated failure for {locale}', retryable=True)
+            return [f'[{locale}] {text}' for text in texts]
+        finally:
+            self.in_flight -= 1
+
+PROVIDERS = {
+    StubProvider.name: StubProvider,
+}
+
+def get_provider(name, **options):
+    try:
+        provider_class = PROVIDERS[name]
+    except KeyError:
+        raise ValueError(f"unknown translation provider '{name}' (available: {', '.join(sorted(PROVIDERS))})")
+    return provider_class(**options)
+
+def positive_int(value):
+    """argparse type for --concurrency and --batch-size (>= 1)."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'must be >= 1, got {number}')
+    return number
+
+def non_negative_int(value):
+    """argparse type for --retries (>= 0)."""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f'must be >= 0, got {number}')
+    return number
+
+def unique_sources(flat_en, overrides):
+    """Distinct English strings still needing translation, in first-seen order."""
+    return list(dict.fromkeys(
+        value for key, value in flat_en.items()
+        if key not in overrides and isinstance(value, str)
+    ))
+
+async def _translate_batch(provider, batch, locale, lang_name, limiter, semaphore, retries, backoff, stats):
+    for attempt in range(retries + 1):
+        async with semaphore:
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                stats['requests'] += 1
+                translations = await provider.translate_batch(batch, locale, lang_name)
+            except (TranslationError, OSError, asyncio.TimeoutError) as e:
+                # Transport failures (connection resets, timeouts) are worth retrying
+                retryable = e.retryable if isinstance(e, TranslationError) else True
+                if not retryable or attempt == retries:
+                    stats['failed'] += len(batch)
+                    stats['errors'].append(f'{locale}: {str(e) or type(e).__name__}')
+                    stats['incomplete'].add(locale)
+                    return {}
+                stats['retries'] += 1
+            else:
+                if len(translations) != len(batch):
+                    stats['failed'] += len(batch)
+                    stats['errors'].append(
+                        f'{locale}: {provider.name} returned {len(translations)} strings for {len(batch)}'
+                    )
+                    stats['incomplete'].add(locale)
+                    return {}
+                return dict(zip(batch, translations))
+        # Back off outside the semaphore so other batches keep the slot busy
+        await asyncio.sleep(backoff * 2 ** attempt)
+    return {}
+
+async def translate_texts(provider, requests, concurrency=4, batch_size=None, retries=3, backoff=0.5):
+    """Translate {locale: (lang_name, [texts])} into {locale: {text: translation}}.
+
+    Returns (results, stats). Batches that still fail after retries are left
+    out of results, so callers fall back to the English text for them;
+    stats['incomplete'] names the locales affected.
+    """
+    if concurrency < 1:
+        raise ValueError(f'concurrency must be >= 1, got {concurrency}')
+    if batch_size is not None and batch_size < 1:
+        raise ValueError(f'batch_size must be >= 1, got {batch_size}')
+    if retries < 0:
+        raise ValueError(f'retries must be >= 0, got {retries}')
+    batch_size = min(batch_size or provider.max_batch_size, provider.max_batch_size)
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(provider.rate_limit, provider.burst) if provider.rate_limit else None
+    stats = {'strings': 0, 'batches': 0, 'requests': 0, 'retries': 0, 'failed': 0, 'errors': [], 'incomplete': set()}
+
+    jobs = []
+    for locale, (lang_name, texts) in requests.items():
+        stats['strings'] += len(texts)
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            jobs.append((locale, _translate_batch(
+                provider, batch, locale, lang_name, limiter, semaphore, retries, backoff, stats,
+            )))
+    stats['batches'] = len(jobs)
+
+    started = time.perf_counter()
+    translated = await asyncio.gather(*(job for _, job in jobs))
+    stats['elapsed'] = time.perf_counter() - started
+
+    results = {locale: {} for locale in requests}
+    for (locale, _), batch_result in zip(jobs, translated):
+        results[locale].update(batch_result)
+    return results, stats
+
+def translate_catalogs(provider, flat_en, targets, concurrency=4, batch_size=None, retries=3, backoff=0.5,
+                       memory=None):
+    """Machine-translate every key not covered by manual overrides.
+
+    targets is a list of (locale, lang_name, overrides). When a
+    TranslationMemory is given, it is consulted first and only the misses are
+    sent to the provider; new results are stored back. Returns
+    ({locale: {key: translation}}, stats), keyed like flat_en.
+    """
+    requests = {}
+    cached = {}
+    for locale, lang_name, overrides in targets:
+        texts = unique_sources(flat_en, overrides)
+        cached[locale] = memory.lookup(texts, locale, provider.name) if memory is not None else {}
+        requests[locale] = (lang_name, [text for text in texts if text not in cached[locale]])
+    results, stats = asyncio.run(
+        translate_texts(provider, requests, concurrency, batch_size, retries, backoff)
+    )
+    stats['cached'] = sum(map(len, cached.values()))
+    if memory is not None:
+        for locale, translations in results.items():
+            memory.store(translations, locale, provider.name)
+
+    stats['keys'] = 0
+    catalogs = {}
+    for locale, lang_name, overrides in targets:
+        by_text = {**cached[locale], **results[locale]}
+        catalogs[locale] = {
+            key: by_text[value] for key, value in flat_en.items()
+            if key not in overrides and isinstance(value, str) and value in by_text
+        }
+        stats['keys'] += len(catalogs[locale])
+    return catalogs, stats
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Measure batching and throughput against the stub provider.')
+    parser.add_argument('--strings', type=int, default=2000, help='distinct source strings')
+    parser.add_argument('--duplicates', type=int, default=2, help='keys sharing each source string')
+    parser.add_argument('--locales', type=int, default=21)
+    parser.add_argument('--latency', type=float, default=0.02, help='simulated seconds per request')
+    parser.add_argument('--failure-rate', type=float, default=0.05)
+    parser.add_argument('--rate-limit', type=float, default=None, help='requests per second')
+    parser.add_argument('--concurrency', type=positive_int, default=8)
+    parser.add_argument('--batch-size', type=positive_int, default=50)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    flat_en = {
+        f'section{i % 20}.key{i}_{copy}': f'Source string {i}'
+        for i in range(args.strings) for copy in range(args.duplicates)
+    }
+    targets = [(f'xx{n}', f'Test language {n}', {}) for n in range(args.locales)]
+    provider = StubProvider(
+        latency=args.latency, failure_rate=args.failure_rate,
+        max_batch_size=args.batch_size, rate_limit=args.rate_limit, burst=args.concurrency,
+    )
+
+    print("🧪 Stub translation throughput")
+    print("=" * 50)
+    catalogs, stats = translate_catalogs(
+        provider, flat_en, targets, concurrency=args.concurrency, batch_size=args.batch_size, backoff=0.01,
+    )
+    print(f"Keys:        {len(flat_en)} x {len(targets)} locales ({stats['keys']} translated)")
+    print(f"Unique sent: {stats['strings']} strings in {stats['batches']} batches ({stats['cached']} from memory)")
+    print(f"Requests:    {stats['requests']} ({stats['retries']} retries, {stats['failed']} strings failed)")
+    print(f"In flight:   peak {provider.peak_in_flight} (limit {args.concurrency})")
+    print(f"Elapsed:     {stats['elapsed']:.2f}s ({stats['strings'] / max(stats['elapsed'], 1e-9):.0f} strings/s)")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
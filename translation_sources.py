@@ -0,0 +1,66 @@
+"""
+Locale Source Data for PipBox
+Hand-written translations live in translations_src/<kind>/<locale>.json and are
+read only when a locale is actually requested, so importing the generators or
+rebuilding one language never loads every other language.
+
+    manual/   flat dot-notation overrides used by generate_translations.py
+    full/     complete nested catalogs used by generate_all_translations.py
+    partial/  nested catalogs merged over English; a bare JSON string
+              (e.g. "es") names another locale to copy instead
+"""
+
+import json
+import os
+from collections.abc import Mapping
+
+SOURCES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'translations_src')
+
+class LocaleSource(Mapping):
+    """Read-only {locale: data} mapping backed by one JSON file per locale.
+
+    Listing locales only reads the directory; a file is parsed on first
+    access and kept for later lookups. bytes_read totals the files parsed.
+    """
+
+    def __init__(self, kind, directory=SOURCES_DIR):
+        self.directory = os.path.join(directory, kind)
+        self._locales = None
+        self._loaded = {}
+        self.bytes_read = 0
+
+    def _path(self, locale):
+        return os.path.join(self.directory, f'{locale}.json')
+
+    @property
+    def locales(self):
+        if self._locales is None:
+            try:
+                names = os.listdir(self.directory)
+            except FileNotFoundError:
+                names = []
+            self._locales = sorted(name[:-len('.json')] for name in names if name.endswith('.json'))
+        return self._locales
+
+    def __getitem__(self, locale):
+        if locale not in self._loaded:
+            try:
+                with open(self._path(locale), 'r', encoding='utf-8') as f:
+                    self.bytes_read += os.fstat(f.fileno()).st_size
+                    self._loaded[locale] = json.load(f)
+            except FileNotFoundError:
+                raise KeyError(locale) from None
+        return self._loaded[locale]
+
+    def __contains__(self, locale):
+        return locale in self._loaded or locale in self.locales
+
+    def __iter__(self):
+        return iter(self.locales)
+
+    def __len__(self):
+        return len(self.locales)
+
+def parse_locale_filter(value):
+    """argparse type for --locale: 'fr,es' -> ['fr', 'es']."""
+    return [locale.strip() for locale in value.split(',') if locale.strip()]
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Translation Validator for PipBox
+Checks every assets/translations/*.json against en.json in a single pass:
+missing and extra keys, placeholder mismatches, strings left in English and coverage.
+Exits non-zero on errors, so it can run as a pre-commit gate.
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+from generate_translations import iter_flat_items
+
+SOURCE_LOCALE = 'en'
+META_KEY = '_meta'  # Generator metadata, not a translatable string
+
+# easy_localization placeholders: named `{duration}` and positional `{}`
+PLACEHOLDER_RE = re.compile(r'\{(\w*)\}')
+
+def placeholders(text):
+    """Sorted placeholder names in text; most strings have none, so skip the regex."""
+    if not isinstance(text, str) or '{' not in text:
+        return ()
+    return tuple(sorted(PLACEHOLDER_RE.findall(text)))
+
+def build_index(translations_dir):
+    """Read every locale file once into a key x locale table.
+
+    Returns (locales, index) where locales[0] is English and index maps each
+    dot-notation key to a list holding its value per locale (None if absent).
+    """
+    paths = sorted(glob.glob(os.path.join(translations_dir, '*.json')))
+    locales = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    if SOURCE_LOCALE not in locales:
+        raise FileNotFoundError(f'{SOURCE_LOCALE}.json not found in {translations_dir}')
+    locales.remove(SOURCE_LOCALE)
+    locales.insert(0, SOURCE_LOCALE)
+
+    index = {}
+    width = len(locales)
+    for column, locale in enumerate(locales):
+        with open(os.path.join(translations_dir, f'{locale}.json'), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        data.pop(META_KEY, None)
+        for key, value in iter_flat_items(data):
+            row = index.get(key)
+            if row is None:
+                row = index[key] = [None] * width
+            row[column] = value
+    return locales, index
+
+def validate(locales, index):
+    """Walk the index once and collect per-locale findings."""
+    report = {
+        locale: {'missing': [], 'extra': [], 'placeholders': [], 'untranslated': [], 'translated': 0}
+        for locale in locales[1:]
+    }
+    source_total = 0
+    for key, row in index.items():
+        source = row[0]
+        if source is None:
+            for locale, value in zip(locales[1:], row[1:]):
+                if value is not None:
+                    report[locale]['extra'].append(key)
+            continue
+
+        source_total += 1
+        expected = placeholders(source)
+        for locale, value in zip(locales[1:], row[1:]):
+            findings = report[locale]
+            if value is None:
+                findings['missing'].append(key)
+                continue
+            # Inlined fast path: no braces on either side means nothing to compare
+            if expected or (isinstance(value, str) and '{' in value):
+                found = placeholders(value)
+            else:
+                found = expected
+            if found != expected:
+                findings['placeholders'].append({
+                    'key': key,
+                    'expected': list(expected),
+                    'found': list(found),
+                })
+            if value == source:
+                findings['untranslated'].append(key)
+            else:
+                findings['translated'] += 1
+
+    for findings in report.values():
+        translated = findings.pop('translated')
+        findings['coverage'] = round(100.0 * translated / source_total, 1) if source_total else 100.0
+    return source_total, report
+
+def error_count(report):
+    return sum(len(f['missing']) + len(f['placeholders']) for f in report.values())
+
+def warning_count(report):
+    return sum(len(f['extra']) + len(f['untranslated']) for f in report.values())
+
+def format_text(source_total, report, verbose=False):
+    lines = [f"{'Locale':<8} {'Coverage':>8} {'Missing':>8} {'Extra':>6} {'Placeholders':>13} {'English':>8}"]
+    for locale, f in report.items():
+        lines.append(
+            f"{locale:<8} {f['coverage']:>7.1f}% {len(f['missing']):>8} {len(f['extra']):>6} "
+            f"{len(f['placeholders']):>13} {len(f['untranslated']):>8}"
+        )
+    for locale, f in report.items():
+        for key in f['missing']:
+            lines.append(f"❌ {locale}: missing '{key}'")
+        for mismatch in f['placeholders']:
+            lines.append(
+                f"❌ {locale}: '{mismatch['key']}' placeholders {mismatch['found']}, expected {mismatch['expected']}"
+            )
+        for key in f['extra']:
+            lines.append(f"⚠️  {locale}: extra key '{key}' (not in {SOURCE_LOCALE}.json)")
+        if verbose:
+            for key in f['untranslated']:
+                lines.append(f"⚠️  {locale}: '{key}' is identical to English")
+    return '\n'.join(lines)
+
+def parse_args(argv=None):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description='Validate PipBox translation catalogs against en.json.')
+    parser.add_argument('--dir', default=os.path.join(script_dir, 'assets', 'translations'),
+                        help='directory holding <locale>.json files')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    parser.add_argument('--strict', action='store_true',
+                        help='also fail on extra keys and strings identical to English')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='list every string identical to English')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    locales, index = build_index(args.dir)
+    source_total, report = validate(locales, index)
+    elapsed = time.perf_counter() - start
+
+    errors = error_count(report)
+    warnings = warning_count(report)
+    if args.json:
+        json.dump({
+            'source_locale': SOURCE_LOCALE,
+            'source_keys': source_total,
+            'errors': errors,
+            'warnings': warnings,
+            'elapsed_seconds': round(elapsed, 4),
+            'locales': report,
+        }, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print("🔍 PipBox Translation Validator")
+        print("=" * 60)
+        print(f"Source: English ({source_total} strings), {len(report)} locales")
+        print()
+        print(format_text(source_total, report, args.verbose))
+        print()
+        print(f"{'✅' if not errors else '❌'} {errors} errors, {warnings} warnings in {elapsed * 1000:.1f}ms")
+
+    failed = errors or (args.strict and warnings)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())